@@ -1,13 +1,37 @@
 """
 Configuration loader utility for purchase predictor project.
-Handles loading configuration from config.yaml with environment variable support using piny.
+Handles loading configuration from config.yaml with environment variable support.
 """
 
 import os
+import re
+import json
 from pathlib import Path
-from piny import YamlLoader
+import yaml
 from dotenv import load_dotenv
 
+# Prefer the libyaml-backed C loader; fall back to the pure-Python loader
+# when PyYAML was built without libyaml.
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Project root (config_loader.py lives in config/) and default file locations
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_DEFAULT_CONFIG = _PROJECT_ROOT / 'config' / 'config.yaml'
+_DEFAULT_ENV = _PROJECT_ROOT / '.env.local'
+
+# Matches ${VARIABLE_NAME} and ${VARIABLE_NAME:default_value} references
+_ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+# (parsed pre-substitution YAML tree, JSON snapshot or None)
+# keyed by (absolute path, mtime in ns, size)
+_CACHE = {}
+
+# Environment files already loaded into os.environ by this process
+_LOADED_ENV_FILES = set()
+
+# Fields that must be present and non-empty in the 'azure' config section
+_REQUIRED_AZURE_FIELDS = ('subscription_id', 'resource_group', 'workspace_name')
+
 
 def load_config(config_file=None, env_file=None):
     """
@@ -20,30 +44,35 @@ def load_config(config_file=None, env_file=None):
     Returns:
         dict: Configuration dictionary with environment variables expanded
     """
-    # Find project root (assuming config_loader.py is in config/ directory)
-    project_root = Path(__file__).parent.parent
-    
     # Set default paths relative to project root
-    if config_file is None:
-        config_file = project_root / 'config' / 'config.yaml'
-    elif not os.path.isabs(config_file):
-        config_file = project_root / config_file
+    config_file = _resolve_config_file(config_file)
     
     if env_file is None:
-        env_file = project_root / '.env.local'
+        env_file = _DEFAULT_ENV
     elif not os.path.isabs(env_file):
-        env_file = project_root / env_file
-    
-    # Load environment variables from .env.local if it exists
-    if Path(env_file).exists():
-        load_dotenv(env_file)
+        env_file = _PROJECT_ROOT / env_file
     
     try:
-        # Use piny to load YAML with automatic environment variable substitution
-        config = YamlLoader(path=str(config_file)).load()
+        # Parse YAML (cached per file version)
+        config, snapshot = _parse_config_file(config_file)
+        
+        # Load environment variables from .env.local if it exists (once per process;
+        # load_dotenv never overrides variables that are already set).
+        # The file may also hold variables config.yaml doesn't reference, such as
+        # the AZURE_CLIENT_* service principal settings read by the credential.
+        env_key = os.path.abspath(env_file)
+        if env_key not in _LOADED_ENV_FILES:
+            if os.path.exists(env_file):
+                load_dotenv(env_file)
+            _LOADED_ENV_FILES.add(env_key)
         
-        # Fallback: if piny didn't substitute, do it manually
-        config = _manual_env_substitution(config)
+        # Substitute ${VARIABLE_NAME} references from the environment.
+        # Both paths build new containers, so callers may safely mutate the result.
+        if snapshot is not None:
+            # Nothing to substitute; decoding the snapshot is cheaper than walking the tree
+            config = json.loads(snapshot)
+        else:
+            config = _manual_env_substitution(config)
         
         return config
     except FileNotFoundError:
@@ -52,9 +81,153 @@ def load_config(config_file=None, env_file=None):
         raise ValueError(f"Error loading configuration from {config_file}: {str(e)}")
 
 
+def write_config_cache(config_file=None):
+    """
+    Write the parsed configuration to a JSON cache file next to the YAML file.
+    
+    The cache holds the tree before environment variable substitution, so
+    ${VARIABLE_NAME} references (and any secrets they resolve to) stay out of it.
+    load_config() refreshes the cache automatically; this forces a rewrite.
+    
+    Args:
+        config_file (str): Path to the YAML configuration file (defaults to config/config.yaml from project root)
+    
+    Returns:
+        Path: Path of the written cache file
+    
+    Raises:
+        ValueError: If the configuration can't be cached as JSON without changing it
+    """
+    config_file = _resolve_config_file(config_file)
+    
+    source_stat = os.stat(config_file)
+    config = load_yaml_file(config_file)
+    
+    cache_file = _cache_file_for(config_file)
+    _write_cache_file(cache_file, config, source_stat)
+    return cache_file
+
+
+def is_config_cache_fresh(config_file=None):
+    """Return True if the JSON cache exists and was written from the current version of the YAML file."""
+    config_file = _resolve_config_file(config_file)
+    return _read_cache_header(_cache_file_for(config_file)) == _source_header(os.stat(config_file))
+
+
+def load_yaml_file(path):
+    """
+    Parse a YAML file with the fastest available safe loader.
+    
+    The file is read in one call and libyaml decodes the raw bytes itself.
+    No environment variable substitution is applied.
+    """
+    return yaml.load(Path(path).read_bytes(), Loader=_YamlLoader)
+
+
+def _resolve_config_file(config_file):
+    """Resolve a config file path relative to the project root."""
+    if config_file is None:
+        return _DEFAULT_CONFIG
+    elif not os.path.isabs(config_file):
+        return _PROJECT_ROOT / config_file
+    return Path(config_file)
+
+
+def _cache_file_for(config_file):
+    """Return the JSON cache path for a YAML config file (config.yaml -> config.cache.json)."""
+    return Path(config_file).with_suffix('.cache.json')
+
+
+def _source_header(source_stat):
+    """Identify the YAML file version a cache was written from."""
+    return {'mtime_ns': source_stat.st_mtime_ns, 'size': source_stat.st_size}
+
+
+def _read_cache_header(cache_file):
+    """Return the source header on the first line of a JSON cache file, or None."""
+    try:
+        with open(cache_file, 'rb') as f:
+            return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def _read_cache_file(cache_file, source_stat):
+    """
+    Return the cached config tree if the cache was written from this YAML version, else None.
+    
+    Only the one-line header is decoded when the cache is stale.
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            if json.loads(f.readline()) != _source_header(source_stat):
+                return None
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache_file(cache_file, config, source_stat):
+    """
+    Atomically write a parsed config tree to a JSON cache file, after its source header.
+    
+    Raises:
+        ValueError: If the tree doesn't survive a JSON round trip unchanged (e.g. non-string
+            mapping keys, which JSON would turn into strings); no cache is written
+    """
+    body = json.dumps(config)
+    if json.loads(body) != config:
+        raise ValueError("Configuration does not round-trip through JSON; not caching it")
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    header = json.dumps(_source_header(source_stat))
+    Path(tmp_file).write_bytes(f"{header}\n{body}".encode())
+    os.replace(tmp_file, cache_file)
+
+
+def _parse_config_file(config_file):
+    """
+    Parse a YAML file, reusing the previous result while the file is unchanged.
+    
+    A JSON cache next to the YAML file is preferred when its header matches the
+    YAML file's current mtime and size, so restoring an older file (e.g. a git
+    checkout) is never masked by a newer cache; otherwise the YAML is parsed
+    and the cache rewritten.
+    
+    Args:
+        config_file: Path to the YAML file
+    
+    Returns:
+        tuple: (parsed YAML tree without environment variable substitution,
+                JSON text of the tree if it references none and round-trips exactly, else None)
+    """
+    path = os.path.abspath(config_file)
+    source_stat = os.stat(path)
+    key = (path, source_stat.st_mtime_ns, source_stat.st_size)
+    
+    cached = _CACHE.get(key)
+    if cached is None:
+        cache_file = _cache_file_for(path)
+        config = _read_cache_file(cache_file, source_stat)
+        if config is None:
+            config = load_yaml_file(path)
+            try:
+                _write_cache_file(cache_file, config, source_stat)
+            except (OSError, TypeError, ValueError):
+                # Read-only checkout or values JSON can't represent exactly; keep using YAML
+                pass
+        
+        text = json.dumps(config, default=str)
+        snapshot = None
+        if '${' not in text and json.loads(text) == config:
+            snapshot = text
+        cached = _CACHE[key] = (config, snapshot)
+    
+    return cached
+
+
 def _manual_env_substitution(obj):
     """
-    Manually substitute environment variables in configuration if piny failed.
+    Substitute environment variables in configuration values.
     Supports both ${VARIABLE_NAME} and ${VARIABLE_NAME:default_value} syntax.
     
     Args:
@@ -63,30 +236,32 @@ def _manual_env_substitution(obj):
     Returns:
         Configuration object with environment variables substituted
     """
-    import re
-    
     if isinstance(obj, dict):
         return {key: _manual_env_substitution(value) for key, value in obj.items()}
     elif isinstance(obj, list):
         return [_manual_env_substitution(item) for item in obj]
     elif isinstance(obj, str):
-        # Look for ${VARIABLE_NAME:default_value} or ${VARIABLE_NAME} patterns
-        def replace_env_var(match):
-            full_match = match.group(1)
-            if ':' in full_match:
-                # Handle ${VARIABLE_NAME:default_value} syntax
-                var_name, default_value = full_match.split(':', 1)
-                return os.environ.get(var_name, default_value)
-            else:
-                # Handle ${VARIABLE_NAME} syntax
-                var_name = full_match
-                return os.environ.get(var_name, match.group(0))  # Return original if not found
-        
-        return re.sub(r'\$\{([^}]+)\}', replace_env_var, obj)
+        # Most values are plain strings; skip the regex scan for them
+        if '${' not in obj:
+            return obj
+        return _ENV_VAR_PATTERN.sub(_replace_env_var, obj)
     else:
         return obj
 
 
+def _replace_env_var(match):
+    """Resolve a single ${VARIABLE_NAME} or ${VARIABLE_NAME:default_value} match."""
+    full_match = match.group(1)
+    if ':' in full_match:
+        # Handle ${VARIABLE_NAME:default_value} syntax
+        var_name, default_value = full_match.split(':', 1)
+        return os.environ.get(var_name, default_value)
+    else:
+        # Handle ${VARIABLE_NAME} syntax
+        var_name = full_match
+        return os.environ.get(var_name, match.group(0))  # Return original if not found
+
+
 def validate_azure_config(config):
     """
     Validate that required Azure configuration is present.
@@ -101,11 +276,11 @@ def validate_azure_config(config):
         raise ValueError("Azure configuration section missing from config")
     
     azure_config = config['azure']
-    required_fields = ['subscription_id', 'resource_group', 'workspace_name']
     
-    for field in required_fields:
-        if field not in azure_config or not azure_config[field]:
+    for field in _REQUIRED_AZURE_FIELDS:
+        value = azure_config.get(field)
+        if not value:
             raise ValueError(f"Required Azure configuration field '{field}' is missing or empty")
         
-        if not isinstance(azure_config[field], str) or not azure_config[field].strip():
-            raise ValueError(f"Azure configuration field '{field}' must be a non-empty string")
\ No newline at end of file
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"Azure configuration field '{field}' must be a non-empty string")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Freeze config.yaml into a JSON cache so load_config() can skip YAML parsing.
+load_config() keeps the cache up to date on its own; use --refresh to force a rewrite.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config.config_loader import write_config_cache, is_config_cache_fresh
+
+
+def main():
+    """Write config/config.cache.json from config/config.yaml."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--refresh', action='store_true', help='Rewrite the cache even if it is up to date')
+    args = parser.parse_args()
+    
+    print("🧊 Freezing configuration...")
+    
+    try:
+        if not args.refresh and is_config_cache_fresh():
+            print("✅ Configuration cache is already up to date (use --refresh to rewrite)")
+            return
+        
+        cache_file = write_config_cache()
+        print(f"✅ Configuration cache written to {cache_file}")
+        
+    except FileNotFoundError as e:
+        print(f"❌ Configuration file not found: {e}")
+        
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
 """
-Test script to verify configuration loading with piny.
+Test script to verify configuration loading with environment variable substitution.
 Run this to test that your .env.local file and config.yaml are set up correctly.
 """
 
-from config_loader import load_config, validate_azure_config
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import config_loader
+from config.config_loader import load_config, validate_azure_config
+
+
+def test_cache_keeps_non_string_keys():
+    """A config JSON can't represent exactly (an int key) is never cached, so reloads match the YAML."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_file = Path(tmp_dir) / 'config.yaml'
+        config_file.write_text("retries:\n  1: fast\n  2: slow\nenabled: true\n")
+        
+        first = load_config(str(config_file), env_file=str(Path(tmp_dir) / '.env.local'))
+        # Forget the in-process parse so the next load goes through the on-disk cache path
+        config_loader._CACHE.clear()
+        second = load_config(str(config_file), env_file=str(Path(tmp_dir) / '.env.local'))
+        
+        assert first == {'retries': {1: 'fast', 2: 'slow'}, 'enabled': True}
+        assert second == first
+        assert not config_loader._cache_file_for(config_file).exists()
 
 
 def main():
@@ -29,6 +50,10 @@ def main():
         print(f"   Model Type: {config.get('model', {}).get('type', 'Not specified')}")
         print(f"   Endpoint Name: {config.get('deployment', {}).get('endpoint_name', 'Not specified')}")
         
+        # Check the JSON cache never changes what the YAML says
+        test_cache_keeps_non_string_keys()
+        print("✅ Configuration cache keeps non-string keys intact!")
+        
         print("\n🎉 Configuration test completed successfully!")
         
     except FileNotFoundError as e:
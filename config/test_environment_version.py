@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that the managed endpoint environment version only changes with its inputs.
+An unchanged conda.yaml and base image must map to the same version, so the registered
+environment (and its built image) is reused instead of rebuilt.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.pipeline.deploy_managed_endpoint import _environment_version, _ENVIRONMENT_IMAGE
+
+
+def test_unchanged_conda_file_reuses_version():
+    """The same conda.yaml content and image give the same version, even from another file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        first = Path(tmp_dir) / 'first.yaml'
+        second = Path(tmp_dir) / 'second.yaml'
+        first.write_text("name: env\ndependencies:\n  - python=3.9\n")
+        second.write_text("name: env\ndependencies:\n  - python=3.9\n")
+
+        version = _environment_version(first, _ENVIRONMENT_IMAGE)
+        assert version == _environment_version(first, _ENVIRONMENT_IMAGE)
+        assert version == _environment_version(second, _ENVIRONMENT_IMAGE)
+
+
+def test_changed_inputs_change_version():
+    """Editing conda.yaml or switching the base image gives a new version."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conda_file = Path(tmp_dir) / 'conda.yaml'
+        conda_file.write_text("name: env\ndependencies:\n  - python=3.9\n")
+        version = _environment_version(conda_file, _ENVIRONMENT_IMAGE)
+
+        assert version != _environment_version(conda_file, _ENVIRONMENT_IMAGE + "-other")
+
+        conda_file.write_text("name: env\ndependencies:\n  - python=3.10\n")
+        assert version != _environment_version(conda_file, _ENVIRONMENT_IMAGE)
+
+
+def main():
+    """Run the environment version checks."""
+    print("🧪 Testing managed endpoint environment versioning...")
+    test_unchanged_conda_file_reuses_version()
+    print("✅ Unchanged conda.yaml reuses the environment version")
+    test_changed_inputs_change_version()
+    print("✅ Changed conda.yaml or image gives a new version")
+
+
+if __name__ == "__main__":
+    main()
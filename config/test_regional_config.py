@@ -4,7 +4,10 @@ Test script to verify Azure ML SDK regional deployment behavior.
 """
 
 import json
-from config_loader import load_config  # Fixed import - now in same directory
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config.config_loader import load_config
 from azure.ai.ml.entities import ManagedOnlineEndpoint
 
 def test_endpoint_config():
@@ -9,7 +9,8 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 import logging
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 from src.utilities.preprocessing import PurchaseDataPreprocessor, save_processed_data
 from config.config_loader import load_config
 
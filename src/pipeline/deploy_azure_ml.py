@@ -6,44 +6,56 @@ This provides a working Azure ML deployment by combining local inference with Az
 import os
 import yaml
 import logging
-import json
-from azure.ai.ml import MLClient
-from azure.identity import DefaultAzureCredential
+from functools import lru_cache
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from config.config_loader import load_config
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from config.config_loader import load_config, load_yaml_file
+from src.utilities.azure_auth import get_credential
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_azure_ml_client(config):
-    """Create and return Azure ML client."""
-    subscription_id = config['azure']['subscription_id']
-    resource_group = config['azure']['resource_group']
-    workspace_name = config['azure']['workspace_name']
-    
-    credential = DefaultAzureCredential()
-    
-    ml_client = MLClient(
-        credential=credential,
+# Prefer the libyaml-backed C dumper when available
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Written by src/pipeline/register.py unless artifacts.registration_info_file overrides it
+_DEFAULT_REGISTRATION_INFO_FILE = 'models/registration_info.yaml'
+
+@lru_cache(maxsize=1)
+def _make_ml_client(subscription_id, resource_group, workspace_name):
+    """Build the MLClient once per workspace, on the shared token-caching credential."""
+    # Azure SDK imports are deferred so that early failures stay fast
+    from azure.ai.ml import MLClient
+    
+    return MLClient(
+        credential=get_credential(),
         subscription_id=subscription_id,
         resource_group_name=resource_group,
         workspace_name=workspace_name
     )
+
+def get_azure_ml_client(config):
+    """Create and return Azure ML client."""
+    azure_config = config['azure']
+    subscription_id = azure_config['subscription_id']
+    resource_group = azure_config['resource_group']
+    workspace_name = azure_config['workspace_name']
+    
+    ml_client = _make_ml_client(subscription_id, resource_group, workspace_name)
     
     logger.info(f"Connected to Azure ML workspace: {workspace_name}")
     return ml_client
 
 def load_registration_info(config):
     """Load model registration information."""
-    registration_info_file = config.get('artifacts', {}).get('registration_info_file', 'models/registration_info.yaml')
+    registration_info_file = config.get('artifacts', {}).get('registration_info_file', _DEFAULT_REGISTRATION_INFO_FILE)
     
     if not os.path.exists(registration_info_file):
         raise FileNotFoundError(f"Registration info not found at {registration_info_file}. Please run src/pipeline/register.py first.")
     
-    with open(registration_info_file, 'r') as f:
-        registration_info = yaml.safe_load(f)
+    registration_info = load_yaml_file(registration_info_file)
     
     logger.info(f"Loaded registration info for model: {registration_info['model_name']} v{registration_info['model_version']}")
     return registration_info
@@ -63,6 +75,7 @@ def verify_model_in_registry(ml_client, registration_info):
 
 def create_deployment_metadata(config, registration_info, model):
     """Create deployment metadata linking to Azure ML."""
+    azure_config = config['azure']
     deployment_info = {
         'deployment_type': 'azure_ml_integrated',
         'azure_ml_model': {
@@ -70,9 +83,9 @@ def create_deployment_metadata(config, registration_info, model):
             'version': model.version,
             'id': model.id,
             'created_time': str(model.creation_context.created_at) if model.creation_context else None,
-            'workspace': config['azure']['workspace_name'],
-            'resource_group': config['azure']['resource_group'],
-            'subscription_id': config['azure']['subscription_id']
+            'workspace': azure_config['workspace_name'],
+            'resource_group': azure_config['resource_group'],
+            'subscription_id': azure_config['subscription_id']
         },
         'local_server': {
             'scoring_script': 'src/utilities/local_inference.py',
@@ -98,7 +111,7 @@ def create_deployment_metadata(config, registration_info, model):
     # Save deployment info
     deployment_info_file = config.get('artifacts', {}).get('endpoint_info_file', 'models/azure_ml_deployment_info.yaml')
     with open(deployment_info_file, 'w') as f:
-        yaml.dump(deployment_info, f, default_flow_style=False)
+        yaml.dump(deployment_info, f, Dumper=_YamlDumper, sort_keys=False, default_flow_style=False)
     
     logger.info(f"Deployment metadata saved to {deployment_info_file}")
     return deployment_info
@@ -154,30 +167,34 @@ def main():
     # Success summary
     logger.info("Azure ML integrated deployment completed successfully!")
     
-    print("\n" + "="*70)
-    print("🚀 AZURE ML INTEGRATED DEPLOYMENT SUCCESSFUL!")
-    print("="*70)
-    print(f"✅ Model verified in Azure ML registry: {model.name} v{model.version}")
-    print(f"✅ Model ID: {model.id}")
-    print(f"✅ Workspace: {config['azure']['workspace_name']}")
-    print(f"✅ Resource Group: {config['azure']['resource_group']}")
-    print("")
-    print("🖥️  LOCAL INFERENCE SERVER SETUP:")
-    print("   Start server: python src/utilities/local_inference.py")
-    print("   Health check: curl http://localhost:5000/health")
-    print("   Test predict:  curl http://localhost:5000/test")
-    print("")
-    print("🔗 AZURE ML INTEGRATION:")
-    print(f"   - Model is registered and accessible in Azure ML Studio")
-    print(f"   - Can be deployed to managed endpoints when subscription issues are resolved")
-    print(f"   - Local server provides same functionality as Azure endpoints")
-    print("")
-    print("📊 NEXT STEPS:")
-    print("   1. Run: python src/utilities/local_inference.py")
-    print("   2. Test: curl http://localhost:5000/test")
-    print("   3. Use the local API for predictions")
-    print("   4. Monitor model performance and retrain as needed")
-    print("="*70)
+    azure_config = config['azure']
+    print("\n".join([
+        "",
+        "="*70,
+        "🚀 AZURE ML INTEGRATED DEPLOYMENT SUCCESSFUL!",
+        "="*70,
+        f"✅ Model verified in Azure ML registry: {model.name} v{model.version}",
+        f"✅ Model ID: {model.id}",
+        f"✅ Workspace: {azure_config['workspace_name']}",
+        f"✅ Resource Group: {azure_config['resource_group']}",
+        "",
+        "🖥️  LOCAL INFERENCE SERVER SETUP:",
+        "   Start server: python src/utilities/local_inference.py",
+        "   Health check: curl http://localhost:5000/health",
+        "   Test predict:  curl http://localhost:5000/test",
+        "",
+        "🔗 AZURE ML INTEGRATION:",
+        f"   - Model is registered and accessible in Azure ML Studio",
+        f"   - Can be deployed to managed endpoints when subscription issues are resolved",
+        f"   - Local server provides same functionality as Azure endpoints",
+        "",
+        "📊 NEXT STEPS:",
+        "   1. Run: python src/utilities/local_inference.py",
+        "   2. Test: curl http://localhost:5000/test",
+        "   3. Use the local API for predictions",
+        "   4. Monitor model performance and retrain as needed",
+        "="*70,
+    ]))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,30 +6,24 @@ This script creates an actual Azure ML Studio hosted inference server.
 import os
 import yaml
 import logging
-import time
 import json
 import datetime
-import uuid
+import hashlib
 import shutil
-from azure.ai.ml import MLClient
-from azure.ai.ml.entities import (
-    ManagedOnlineEndpoint, 
-    ManagedOnlineDeployment,
-    Environment,
-    CodeConfiguration
-)
-from azure.identity import DefaultAzureCredential
-from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 from config.config_loader import load_config
+from src.utilities.azure_auth import get_credential
 from src.utilities.endpoint_naming import (
     generate_unique_endpoint_name,
     generate_unique_deployment_name,
     create_endpoint_with_cleanup_retry,
     create_deployment_with_retry,
+    with_transient_retry,
     validate_azure_ml_name,
-    create_regional_endpoint_config,
     validate_target_region
 )
 
@@ -37,37 +31,111 @@ from src.utilities.endpoint_naming import (
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed C loader/dumper when available
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Bytes read from registration_info.yaml before falling back to a full parse
+_REGISTRATION_HEADER_BYTES = 4096
+
+# Deployment environment (separate from deploy_aci.py's); its version is derived from the
+# conda spec and image reference. A tag-based image isn't re-pulled while both are unchanged;
+# pin it by @sha256: digest to control exactly which base image is built on
+_ENVIRONMENT_NAME = "purchase-predictor-managed-env"
+_ENVIRONMENT_CONDA_FILE = "conda.yaml"
+_ENVIRONMENT_IMAGE = "mcr.microsoft.com/azureml/openmpi4.1.0-ubuntu22.04:latest"  # More modern Ubuntu base
+
+# Parsed registration info keyed by path: (mtime in ns, data)
+_REGISTRATION_CACHE = {}
+
+# Sample request for the post-deployment smoke test, serialized once per process
+_TEST_DATA = {
+    "data": [
+        [25.99, 4, 1, 1],  # Low price, good rating, category 1, previous customer
+        [150.00, 2, 0, 0]  # High price, poor rating, category 0, new customer
+    ]
+}
+_TEST_PAYLOAD = json.dumps(_TEST_DATA).encode()
+
+# HTTP transport settings: connections kept per host, connect/read timeouts in seconds
+_HTTP_POOL_SIZE = 20
+_HTTP_CONNECTION_TIMEOUT = 30
+_HTTP_READ_TIMEOUT = 300
+
+# Process-wide HTTP session and transport, created on first use
+_SESSION = None
+_TRANSPORT = None
+
+def _get_session():
+    """Return the pooled requests.Session shared by the MLClient transport and direct endpoint calls."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        # Keep-alive connections are reused across ARM calls and endpoint invocations;
+        # the pool is sized so the concurrent endpoint/environment/deployment polls
+        # don't wait on each other for a connection
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _SESSION = session
+    return _SESSION
+
+def _get_transport():
+    """Return one RequestsTransport over the pooled session, shared by all MLClient pipelines."""
+    global _TRANSPORT
+    if _TRANSPORT is None:
+        from azure.core.pipeline.transport import RequestsTransport
+        
+        _TRANSPORT = RequestsTransport(
+            session=_get_session(),
+            connection_verify=True,
+            connection_timeout=_HTTP_CONNECTION_TIMEOUT,
+            read_timeout=_HTTP_READ_TIMEOUT
+        )
+    return _TRANSPORT
+
+@lru_cache(maxsize=4)
+def _build_client(subscription_id, resource_group, workspace_name):
+    """Build and verify the MLClient once per workspace; later calls reuse it."""
+    # Azure SDK imports are deferred so that non-Azure code paths stay fast
+    from azure.ai.ml import MLClient
+    
+    ml_client = MLClient(
+        credential=get_credential(),
+        subscription_id=subscription_id,
+        resource_group_name=resource_group,
+        workspace_name=workspace_name,
+        transport=_get_transport()
+    )
+    
+    # Test connection (only when the client is first built)
+    workspace = ml_client.workspaces.get()
+    logger.info("✅ Successfully connected to Azure ML workspace: %s", workspace.name)
+    logger.info("   Location: %s", workspace.location)
+    logger.info("   Resource Group: %s", workspace.resource_group)
+    
+    return ml_client
+
 def get_azure_ml_client(config):
     """Create and return Azure ML client with enhanced error handling."""
-    subscription_id = config['azure']['subscription_id']
-    resource_group = config['azure']['resource_group']
-    workspace_name = config['azure']['workspace_name']
+    azure_config = config['azure']
+    subscription_id = azure_config['subscription_id']
+    resource_group = azure_config['resource_group']
+    workspace_name = azure_config['workspace_name']
     
-    logger.info(f"Connecting to Azure ML workspace...")
-    logger.info(f"  Subscription: {subscription_id}")
-    logger.info(f"  Resource Group: {resource_group}")
-    logger.info(f"  Workspace: {workspace_name}")
+    logger.info("Connecting to Azure ML workspace...")
+    logger.info("  Subscription: %s", subscription_id)
+    logger.info("  Resource Group: %s", resource_group)
+    logger.info("  Workspace: %s", workspace_name)
     
     try:
-        credential = DefaultAzureCredential()
-        
-        ml_client = MLClient(
-            credential=credential,
-            subscription_id=subscription_id,
-            resource_group_name=resource_group,
-            workspace_name=workspace_name
-        )
-        
-        # Test connection
-        workspace = ml_client.workspaces.get()
-        logger.info(f"✅ Successfully connected to Azure ML workspace: {workspace.name}")
-        logger.info(f"   Location: {workspace.location}")
-        logger.info(f"   Resource Group: {workspace.resource_group}")
-        
-        return ml_client
+        return _build_client(subscription_id, resource_group, workspace_name)
         
     except Exception as e:
-        logger.error(f"❌ Failed to connect to Azure ML workspace: {e}")
+        logger.error("❌ Failed to connect to Azure ML workspace: %s", e)
         logger.error("   Check your Azure credentials and workspace configuration")
         raise
 
@@ -75,16 +143,46 @@ def load_registration_info(config):
     """Load model registration information."""
     registration_info_file = config.get('artifacts', {}).get('registration_info_file', 'models/registration_info.yaml')
     
-    if not os.path.exists(registration_info_file):
-        raise FileNotFoundError(f"Registration info not found at {registration_info_file}. Please run src/pipeline/register.py first.")
+    try:
+        mtime_ns = os.stat(registration_info_file).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Registration info not found at {registration_info_file}. Please run src/pipeline/register.py first.") from None
     
-    with open(registration_info_file, 'r') as f:
-        registration_info = yaml.safe_load(f)
+    # Re-read only when the file changed since the last load
+    cached = _REGISTRATION_CACHE.get(registration_info_file)
+    if cached is None or cached[0] != mtime_ns:
+        cached = _REGISTRATION_CACHE[registration_info_file] = (mtime_ns, _read_registration_header(registration_info_file))
+    registration_info = cached[1]
     
     logger.info(f"📋 Loaded registration info:")
     logger.info(f"   Model: {registration_info['model_name']} v{registration_info['model_version']}")
     return registration_info
 
+def _read_registration_header(registration_info_file):
+    """
+    Read model_name/model_version without parsing the whole registration file.
+    
+    Only the leading block of the file is parsed (cut at the last complete line);
+    if that block doesn't yield both keys, the full document is parsed instead.
+    """
+    with open(registration_info_file, 'rb') as f:
+        # One extra byte tells us whether anything follows the header block
+        block = f.read(_REGISTRATION_HEADER_BYTES + 1)
+        if len(block) <= _REGISTRATION_HEADER_BYTES:
+            # Whole file fits in the header block
+            return yaml.load(block, Loader=_YamlLoader)
+        
+        header = block[:block.rfind(b'\n', 0, _REGISTRATION_HEADER_BYTES) + 1]
+        try:
+            registration_info = yaml.load(header, Loader=_YamlLoader)
+            if isinstance(registration_info, dict) and 'model_name' in registration_info and 'model_version' in registration_info:
+                return registration_info
+        except yaml.YAMLError:
+            pass
+        
+        # Parse the full document from a single contiguous buffer
+        return yaml.load(block + f.read(), Loader=_YamlLoader)
+
 def prepare_deployment_artifacts():
     """
     Prepare deployment artifacts with archival system.
@@ -177,31 +275,44 @@ def prepare_deployment_artifacts():
     
     return 'server'
 
+def _utc_timestamp():
+    """Current time as UTC ISO-8601 (e.g. 2025-10-06T14:30:15+00:00), for resource tags."""
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+def _clean_tags(tags):
+    """Drop empty tag values and stringify the rest, so ARM doesn't reject the request."""
+    return {key: str(value) for key, value in tags.items() if value not in (None, "", [])}
+
 def create_optimized_endpoint(ml_client, config):
     """Create endpoint with unique naming and regional deployment support."""
-    base_endpoint_name = config['deployment'].get('endpoint_name', 'purchase-predictor-endpoint')
-    target_region = config['deployment'].get('region', '').strip()
+    from azure.ai.ml.entities import ManagedOnlineEndpoint
+    
+    deployment_section = config['deployment']
+    base_endpoint_name = deployment_section.get('endpoint_name', 'purchase-predictor-endpoint')
+    target_region = deployment_section.get('region', '').strip()
     
     # Debug logging for configuration analysis
-    logger.info(f"🐛 DEBUG: Regional deployment configuration analysis:")
-    logger.info(f"   Full config structure: {json.dumps(config, indent=2, default=str)}")
-    logger.info(f"   Deployment section: {config.get('deployment', {})}")
-    logger.info(f"   Raw region value: '{config['deployment'].get('region', 'NOT_FOUND')}'")
-    logger.info(f"   Stripped region value: '{target_region}'")
-    logger.info(f"   Region is empty/None: {not target_region}")
-    logger.info(f"   Region length: {len(target_region) if target_region else 0}")
+    logger.info("🐛 DEBUG: Regional deployment configuration analysis:")
+    if logger.isEnabledFor(logging.INFO):
+        # The config dump is only serialized when it will actually be logged
+        logger.info("   Full config structure: %s", json.dumps(config, indent=2, default=str))
+    logger.info("   Deployment section: %s", deployment_section)
+    logger.info("   Raw region value: '%s'", deployment_section.get('region', 'NOT_FOUND'))
+    logger.info("   Stripped region value: '%s'", target_region)
+    logger.info("   Region is empty/None: %s", not target_region)
+    logger.info("   Region length: %s", len(target_region) if target_region else 0)
     
     # Validate target region if specified
     if target_region:
         is_valid_region, region_msg = validate_target_region(target_region)
         if not is_valid_region:
-            logger.error(f"❌ Invalid target region: {region_msg}")
+            logger.error("❌ Invalid target region: %s", region_msg)
             raise ValueError(f"Invalid target region: {region_msg}")
-        logger.info(f"✅ Target region validated: {region_msg}")
+        logger.info("✅ Target region validated: %s", region_msg)
     else:
-        logger.warning(f"⚠️ No target region specified in config - deployment will use workspace region")
-        logger.warning(f"   This explains why you're seeing 'centralus' in the URL")
-        logger.warning(f"   The workspace is in Central US, so endpoints default there")
+        logger.warning("⚠️ No target region specified in config - deployment will use workspace region")
+        logger.warning("   This explains why you're seeing 'centralus' in the URL")
+        logger.warning("   The workspace is in Central US, so endpoints default there")
     
     # Generate unique endpoint name
     unique_endpoint_name = generate_unique_endpoint_name(base_endpoint_name.split('-')[0])
@@ -209,17 +320,17 @@ def create_optimized_endpoint(ml_client, config):
     # Validate the generated name
     is_valid, error_msg = validate_azure_ml_name(unique_endpoint_name, "endpoint")
     if not is_valid:
-        logger.warning(f"Generated name validation failed: {error_msg}")
+        logger.warning("Generated name validation failed: %s", error_msg)
         # Fallback to a simpler unique name
         unique_endpoint_name = generate_unique_endpoint_name("pp")
     
-    logger.info(f"🚀 Creating managed online endpoint with regional deployment:")
-    logger.info(f"   Original config name: {base_endpoint_name}")
-    logger.info(f"   Generated unique name: {unique_endpoint_name}")
+    logger.info("🚀 Creating managed online endpoint with regional deployment:")
+    logger.info("   Original config name: %s", base_endpoint_name)
+    logger.info("   Generated unique name: %s", unique_endpoint_name)
     if target_region:
-        logger.info(f"   🌍 Target region: {target_region} (WILL OVERRIDE WORKSPACE REGION)")
+        logger.info("   🌍 Target region: %s (WILL OVERRIDE WORKSPACE REGION)", target_region)
     else:
-        logger.warning(f"   🌍 Target region: workspace region (centralus) - NO OVERRIDE")
+        logger.warning("   🌍 Target region: workspace region (centralus) - NO OVERRIDE")
     
     # Create endpoint configuration with regional settings
     endpoint_config = ManagedOnlineEndpoint(
@@ -227,84 +338,127 @@ def create_optimized_endpoint(ml_client, config):
         description=f"Azure ML Studio hosted inference server for purchase predictor (region: {target_region or 'workspace'})",
         auth_mode="key",
         location=target_region if target_region else None,  # Set region if specified
-        tags={
+        tags=_clean_tags({
             "project": "purchase-predictor",
             "environment": "production",
             "deployment_type": "azure_ml_studio_hosted_regional",
-            "created": datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"),
+            "created": _utc_timestamp(),
             "original_name": base_endpoint_name,
             "unique_name": unique_endpoint_name,
             "target_region": target_region or "workspace_region"
-        }
+        })
     )
     
     # Debug the endpoint configuration before creation
-    logger.info(f"🐛 DEBUG: ManagedOnlineEndpoint configuration:")
-    logger.info(f"   name: {endpoint_config.name}")
-    logger.info(f"   location: {getattr(endpoint_config, 'location', 'NOT_SET')}")
-    logger.info(f"   auth_mode: {endpoint_config.auth_mode}")
-    logger.info(f"   description: {endpoint_config.description}")
-    logger.info(f"   Target region passed to Azure: {target_region if target_region else 'None (will use workspace region)'}")
+    logger.info("🐛 DEBUG: ManagedOnlineEndpoint configuration:")
+    logger.info("   name: %s", endpoint_config.name)
+    logger.info("   location: %s", getattr(endpoint_config, 'location', 'NOT_SET'))
+    logger.info("   auth_mode: %s", endpoint_config.auth_mode)
+    logger.info("   description: %s", endpoint_config.description)
+    logger.info("   Target region passed to Azure: %s", target_region if target_region else 'None (will use workspace region)')
     
     logger.info("⏳ Creating endpoint with cleanup and retry logic...")
     logger.info("   🔄 Automatic cleanup of failed endpoints")
     logger.info("   🔁 Up to 3 retry attempts with new names")
-    logger.info("   ⏱️ 5-minute delays between retries")
+    logger.info("   ⏱️ Jittered backoff of up to 5 minutes between retries")
     if target_region:
-        logger.info(f"   🌍 Deploying to {target_region} region")
+        logger.info("   🌍 Deploying to %s region", target_region)
     
     try:
         # Use the robust endpoint creation with retry logic
         endpoint = create_endpoint_with_cleanup_retry(ml_client, endpoint_config)
         
-        logger.info(f"✅ Endpoint created successfully!")
-        logger.info(f"   Final endpoint name: {endpoint.name}")
-        logger.info(f"   Provisioning state: {endpoint.provisioning_state}")
-        if hasattr(endpoint, 'location') and endpoint.location:
-            logger.info(f"   Deployed region: {endpoint.location}")
+        logger.info("✅ Endpoint created successfully!")
+        logger.info("   Final endpoint name: %s", endpoint.name)
+        logger.info("   Provisioning state: %s", endpoint.provisioning_state)
+        if getattr(endpoint, 'location', None):
+            logger.info("   Deployed region: %s", endpoint.location)
         
         # Update config to track the actual endpoint name used
-        config['deployment']['actual_endpoint_name'] = endpoint.name
-        config['deployment']['actual_region'] = getattr(endpoint, 'location', target_region or 'workspace')
+        deployment_section['actual_endpoint_name'] = endpoint.name
+        deployment_section['actual_region'] = getattr(endpoint, 'location', target_region or 'workspace')
         
         return endpoint
         
     except Exception as e:
-        logger.error(f"❌ Failed to create endpoint after all retry attempts: {e}")
+        logger.error("❌ Failed to create endpoint after all retry attempts: %s", e)
         logger.error("   This may indicate:")
         logger.error("   - Subscription quota exceeded in target region")
         logger.error("   - Target region doesn't support required instance types")
         logger.error("   - Resource provider registration issues")
         logger.error("   - Insufficient permissions in target region")
         if target_region:
-            logger.error(f"   - Try a different region or remove region constraint")
+            logger.error("   - Try a different region or remove region constraint")
         raise
 
+def _environment_version(conda_file, image):
+    """
+    Content hash of the conda spec and base image, so an unchanged pair maps to the same version.
+    
+    The image reference is hashed as written: for a tag-based image (e.g. ':latest') a
+    newer image behind the same tag keeps the version, and the registered environment
+    is reused until conda.yaml or the reference changes.
+    """
+    digest = hashlib.sha256()
+    with open(conda_file, 'rb') as f:
+        digest.update(f.read())
+    digest.update(image.encode())
+    return digest.hexdigest()[:12]
+
 def create_optimized_environment(ml_client, config):
-    """Create environment optimized for managed endpoints."""
-    environment_name = f"purchase-predictor-env-{int(time.time())}"  # Unique name
+    """Create environment optimized for managed endpoints.
+    
+    The environment version is a hash of conda.yaml and the image reference, so an
+    unchanged spec reuses the registered environment (and its built image) instead
+    of triggering a new container build.
+    """
+    from azure.ai.ml.entities import Environment
+    from azure.core.exceptions import ResourceNotFoundError
     
-    logger.info(f"🐳 Creating deployment environment: {environment_name}")
+    environment_name = _ENVIRONMENT_NAME
+    environment_version = _environment_version(_ENVIRONMENT_CONDA_FILE, _ENVIRONMENT_IMAGE)
+    
+    try:
+        environment = with_transient_retry(
+            lambda: ml_client.environments.get(name=environment_name, version=environment_version),
+            "Environment lookup"
+        )
+        logger.info(f"♻️ Reusing environment {environment_name}:{environment_version} (conda.yaml and image unchanged)")
+        return environment
+    except ResourceNotFoundError:
+        pass
+    
+    logger.info(f"🐳 Creating deployment environment: {environment_name}:{environment_version}")
     
     # Create environment with modern base image that supports NumPy 2.x
     environment = Environment(
         name=environment_name,
+        version=environment_version,
         description="Modern environment for purchase predictor managed endpoint with NumPy 2.x support",
-        conda_file="conda.yaml",
-        image="mcr.microsoft.com/azureml/openmpi4.1.0-ubuntu22.04:latest"  # More modern Ubuntu base
+        conda_file=_ENVIRONMENT_CONDA_FILE,
+        image=_ENVIRONMENT_IMAGE
     )
     
     try:
-        environment = ml_client.environments.create_or_update(environment)
-        logger.info(f"✅ Environment {environment_name} created successfully")
+        environment = with_transient_retry(
+            lambda: ml_client.environments.create_or_update(environment),
+            "Environment creation"
+        )
+        logger.info(f"✅ Environment {environment.name}:{environment.version} created successfully")
         return environment
     except Exception as e:
         logger.error(f"❌ Failed to create environment: {e}")
         raise
 
-def create_optimized_deployment(ml_client, config, registration_info, endpoint, environment):
-    """Create deployment with unique naming and retry logic."""
-    base_deployment_name = config['deployment'].get('deployment_name', 'purchase-predictor-deployment')
+def create_optimized_deployment(ml_client, config, registration_info, endpoint, environment, server_dir=None):
+    """Create deployment with unique naming and retry logic.
+    
+    server_dir is the already-prepared artifacts directory; it is prepared here when omitted.
+    """
+    from azure.ai.ml.entities import ManagedOnlineDeployment, CodeConfiguration
+    
+    deployment_section = config['deployment']
+    base_deployment_name = deployment_section.get('deployment_name', 'purchase-predictor-deployment')
     endpoint_name = endpoint.name
     
     # Generate unique deployment name
@@ -329,8 +483,9 @@ def create_optimized_deployment(ml_client, config, registration_info, endpoint,
     
     logger.info(f"📦 Using model: {model_reference}")
     
-    # Prepare deployment artifacts with archival
-    server_dir = prepare_deployment_artifacts()
+    # Prepare deployment artifacts with archival (unless main() already did)
+    if server_dir is None:
+        server_dir = prepare_deployment_artifacts()
     
     # Create deployment configuration with optimized settings
     deployment_config = ManagedOnlineDeployment(
@@ -344,16 +499,16 @@ def create_optimized_deployment(ml_client, config, registration_info, endpoint,
         ),
         instance_type="Standard_DS1_v2",  # Smaller instance type to fit quota constraints
         instance_count=1,
-        tags={
+        tags=_clean_tags({
             "model_name": model_name,
             "model_version": model_version,
             "deployment_type": "azure_ml_studio_hosted_unique",
             "original_name": base_deployment_name,
             "unique_name": unique_deployment_name,
-            "created": datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"),
+            "created": _utc_timestamp(),
             "server_directory": server_dir,
             "deployment_artifacts": "archived"
-        }
+        })
     )
     
     logger.info("⏳ Deploying to Azure ML Studio with retry logic...")
@@ -372,7 +527,7 @@ def create_optimized_deployment(ml_client, config, registration_info, endpoint,
         logger.info("🎉 Your model is now hosted on Azure ML Studio managed infrastructure!")
         
         # Update config to track the actual deployment name used
-        config['deployment']['actual_deployment_name'] = deployment.name
+        deployment_section['actual_deployment_name'] = deployment.name
         
         return deployment
         
@@ -386,37 +541,49 @@ def create_optimized_deployment(ml_client, config, registration_info, endpoint,
         logger.error(f"  - Check deployment artifacts in: {server_dir}")
         raise
 
-def configure_endpoint_traffic(ml_client, endpoint_name, deployment_name):
-    """Set 100% traffic to the deployment using actual names."""
+def configure_endpoint_traffic(ml_client, endpoint, deployment_name):
+    """
+    Set 100% traffic to the deployment using actual names.
+    
+    The endpoint object returned by create_optimized_endpoint is updated in place,
+    so no extra GET is needed; the endpoint returned by the update is passed back.
+    Traffic can't be set when the endpoint is created, since ARM rejects routes to
+    deployments that don't exist yet.
+    """
+    endpoint_name = endpoint.name
     logger.info(f"🔀 Configuring traffic routing...")
     logger.info(f"   Endpoint: {endpoint_name}")
     logger.info(f"   Deployment: {deployment_name}")
     
     try:
-        endpoint = ml_client.online_endpoints.get(endpoint_name)
         endpoint.traffic = {deployment_name: 100}
+        if endpoint.tags:
+            endpoint.tags = _clean_tags(endpoint.tags)
         
-        ml_client.online_endpoints.begin_create_or_update(endpoint).result()
+        endpoint = with_transient_retry(
+            lambda: ml_client.online_endpoints.begin_create_or_update(endpoint).result(),
+            "Traffic update"
+        )
         logger.info(f"✅ Traffic set to 100% for deployment: {deployment_name}")
         logger.info(f"   All requests to {endpoint_name} will route to {deployment_name}")
+        return endpoint
     except Exception as e:
         logger.error(f"❌ Failed to set traffic: {e}")
         raise
 
-def get_hosted_endpoint_details(ml_client, config, endpoint_name):
-    """Get and save hosted endpoint details with actual names."""
+def get_hosted_endpoint_details(ml_client, config, endpoint):
+    """Save and display hosted endpoint details with actual names."""
     logger.info("📊 Retrieving hosted endpoint details...")
     
     try:
-        endpoint = ml_client.online_endpoints.get(endpoint_name)
-        
         # Get actual names and regional info
         actual_endpoint_name = endpoint.name
-        actual_deployment_name = config['deployment'].get('actual_deployment_name', 'unknown')
-        original_endpoint_name = config['deployment'].get('endpoint_name', 'unknown')
-        original_deployment_name = config['deployment'].get('deployment_name', 'unknown')
-        target_region = config['deployment'].get('region', '')
-        actual_region = config['deployment'].get('actual_region', getattr(endpoint, 'location', 'unknown'))
+        deployment_section = config['deployment']
+        actual_deployment_name = deployment_section.get('actual_deployment_name', 'unknown')
+        original_endpoint_name = deployment_section.get('endpoint_name', 'unknown')
+        original_deployment_name = deployment_section.get('deployment_name', 'unknown')
+        target_region = deployment_section.get('region', '')
+        actual_region = deployment_section.get('actual_region', getattr(endpoint, 'location', 'unknown'))
         
         endpoint_info = {
             'deployment_type': 'azure_ml_studio_hosted_regional',
@@ -436,12 +603,12 @@ def get_hosted_endpoint_details(ml_client, config, endpoint_name):
             },
             'endpoint_details': {
                 'scoring_uri': endpoint.scoring_uri,
-                'swagger_uri': endpoint.swagger_uri if hasattr(endpoint, 'swagger_uri') else None,
+                'swagger_uri': getattr(endpoint, 'swagger_uri', None),
                 'auth_mode': endpoint.auth_mode,
-                'location': endpoint.location if hasattr(endpoint, 'location') else None,
+                'location': getattr(endpoint, 'location', None),
                 'provisioning_state': endpoint.provisioning_state,
-                'traffic': endpoint.traffic if hasattr(endpoint, 'traffic') else {},
-                'tags': endpoint.tags if hasattr(endpoint, 'tags') else {},
+                'traffic': getattr(endpoint, 'traffic', {}),
+                'tags': getattr(endpoint, 'tags', {}),
                 'created_at': str(endpoint.creation_context.created_at) if endpoint.creation_context else None
             },
             'usage_instructions': {
@@ -464,99 +631,103 @@ def get_hosted_endpoint_details(ml_client, config, endpoint_name):
         endpoint_info_file = config.get('artifacts', {}).get('endpoint_info_file', 'models/endpoint_info.yaml')
         
         with open(endpoint_info_file, 'w') as f:
-            yaml.dump(endpoint_info, f, default_flow_style=False)
-        
-        logger.info(f"✅ Endpoint details saved to {endpoint_info_file}")
-        
-        # Display comprehensive information
-        print("\n" + "="*80)
-        print("🎉 AZURE ML STUDIO HOSTED ENDPOINT DEPLOYED SUCCESSFULLY!")
-        print("="*80)
-        print(f"🌐 Endpoint Name: {actual_endpoint_name}")
-        print(f"📊 Original Config Name: {original_endpoint_name}")
-        print(f"� Unique Naming: ✅ Enabled (prevents common naming conflicts)")
-        print("")
-        print(f"�📡 Scoring URI: {endpoint.scoring_uri}")
-        print(f"🔐 Auth Mode: {endpoint.auth_mode}")
-        print(f"📊 Provisioning State: {endpoint.provisioning_state}")
-        if endpoint.traffic:
-            print(f"🔀 Traffic Distribution: {endpoint.traffic}")
-        print("")
-        print("� REGIONAL DEPLOYMENT:")
+            yaml.dump(endpoint_info, f, Dumper=_YamlDumper, default_flow_style=False)
+        
+        logger.info("✅ Endpoint details saved to %s", endpoint_info_file)
+        
+        # Display comprehensive information (one write to stdout)
         if target_region:
-            print(f"   Target Region: {target_region}")
-            print(f"   Actual Region: {actual_region}")
-            print(f"   Regional Deployment: ✅ Enabled")
+            region_lines = [
+                f"   Target Region: {target_region}",
+                f"   Actual Region: {actual_region}",
+                f"   Regional Deployment: ✅ Enabled",
+            ]
         else:
-            print(f"   Region: {actual_region} (workspace region)")
-            print(f"   Regional Deployment: Default (workspace region)")
-        print("")
-        print("�🏗️ DEPLOYMENT DETAILS:")
-        print(f"   Deployment Name: {actual_deployment_name}")
-        print(f"   Original Config Name: {original_deployment_name}")
-        print(f"   Instance Type: Standard_DS1_v2")
-        print(f"   Instance Count: 1")
-        print("")
-        print("🚀 Your model is now hosted on Azure ML Studio managed infrastructure!")
-        print("📱 Use the scoring URI above for production predictions")
-        print("🎛️ Monitor and manage your endpoint in Azure ML Studio portal")
-        print("")
-        print("📋 DEPLOYMENT FEATURES:")
-        print("   ✅ Unique naming prevents conflicts")
-        print("   ✅ Regional deployment support")
-        print("   ✅ Automatic retry with cleanup")
-        print("   ✅ Enterprise-grade reliability")
-        print("="*80)
+            region_lines = [
+                f"   Region: {actual_region} (workspace region)",
+                f"   Regional Deployment: Default (workspace region)",
+            ]
+        print("\n".join([
+            "",
+            "="*80,
+            "🎉 AZURE ML STUDIO HOSTED ENDPOINT DEPLOYED SUCCESSFULLY!",
+            "="*80,
+            f"🌐 Endpoint Name: {actual_endpoint_name}",
+            f"📊 Original Config Name: {original_endpoint_name}",
+            f"� Unique Naming: ✅ Enabled (prevents common naming conflicts)",
+            "",
+            f"�📡 Scoring URI: {endpoint.scoring_uri}",
+            f"🔐 Auth Mode: {endpoint.auth_mode}",
+            f"📊 Provisioning State: {endpoint.provisioning_state}",
+            *([f"🔀 Traffic Distribution: {endpoint.traffic}"] if endpoint.traffic else []),
+            "",
+            "� REGIONAL DEPLOYMENT:",
+            *region_lines,
+            "",
+            "�🏗️ DEPLOYMENT DETAILS:",
+            f"   Deployment Name: {actual_deployment_name}",
+            f"   Original Config Name: {original_deployment_name}",
+            f"   Instance Type: Standard_DS1_v2",
+            f"   Instance Count: 1",
+            "",
+            "🚀 Your model is now hosted on Azure ML Studio managed infrastructure!",
+            "📱 Use the scoring URI above for production predictions",
+            "🎛️ Monitor and manage your endpoint in Azure ML Studio portal",
+            "",
+            "📋 DEPLOYMENT FEATURES:",
+            "   ✅ Unique naming prevents conflicts",
+            "   ✅ Regional deployment support",
+            "   ✅ Automatic retry with cleanup",
+            "   ✅ Enterprise-grade reliability",
+            "="*80,
+        ]))
         
         return endpoint
         
     except Exception as e:
-        logger.error(f"❌ Failed to get endpoint details: {e}")
+        logger.error("❌ Failed to get endpoint details: %s", e)
         raise
 
-def test_hosted_endpoint(ml_client, endpoint_name, deployment_name):
-    """Test the hosted endpoint with sample data using actual names."""
+def test_hosted_endpoint(ml_client, endpoint_name, deployment_name, scoring_uri=None):
+    """Test the hosted endpoint with sample data using actual names.
+    
+    With the endpoint's scoring_uri the request is POSTed directly over the pooled
+    session using the endpoint key; otherwise it goes through online_endpoints.invoke,
+    which needs the payload in a file.
+    """
     logger.info("🧪 Testing hosted endpoint...")
     logger.info(f"   Testing endpoint: {endpoint_name}")
     logger.info(f"   Using deployment: {deployment_name}")
     
-    # Sample test data
-    test_data = {
-        "data": [
-            [25.99, 4, 1, 1],  # Low price, good rating, category 1, previous customer
-            [150.00, 2, 0, 0]  # High price, poor rating, category 0, new customer
-        ]
-    }
-    
     try:
-        import tempfile
+        if scoring_uri:
+            keys = ml_client.online_endpoints.get_keys(endpoint_name)
+            http_response = _get_session().post(
+                scoring_uri,
+                data=_TEST_PAYLOAD,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Authorization': f'Bearer {keys.primary_key}',
+                    'azureml-model-deployment': deployment_name
+                },
+                timeout=(_HTTP_CONNECTION_TIMEOUT, _HTTP_READ_TIMEOUT)
+            )
+            http_response.raise_for_status()
+            response = http_response.text
+        else:
+            response = _invoke_from_file(ml_client, endpoint_name, deployment_name)
         
-        # Create temporary file with test data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_data, f)
-            temp_file = f.name
+        logger.info(f"✅ Hosted endpoint test successful!")
+        logger.info(f"📊 Predictions: {response}")
+        logger.info("🎯 Test interpretations:")
+        logger.info("   [25.99, 4, 1, 1] -> Expected: High purchase probability")
+        logger.info("   [150.00, 2, 0, 0] -> Expected: Low purchase probability")
+        logger.info("")
+        logger.info("🔗 Test Results Summary:")
+        logger.info(f"   ✅ Endpoint {endpoint_name} is responding correctly")
+        logger.info(f"   ✅ Deployment {deployment_name} is processing requests")
+        logger.info(f"   ✅ Model is making predictions as expected")
         
-        try:
-            response = ml_client.online_endpoints.invoke(
-                endpoint_name=endpoint_name,
-                request_file=temp_file,
-                deployment_name=deployment_name
-            )
-            
-            logger.info(f"✅ Hosted endpoint test successful!")
-            logger.info(f"📊 Predictions: {response}")
-            logger.info("🎯 Test interpretations:")
-            logger.info("   [25.99, 4, 1, 1] -> Expected: High purchase probability")
-            logger.info("   [150.00, 2, 0, 0] -> Expected: Low purchase probability")
-            logger.info("")
-            logger.info("🔗 Test Results Summary:")
-            logger.info(f"   ✅ Endpoint {endpoint_name} is responding correctly")
-            logger.info(f"   ✅ Deployment {deployment_name} is processing requests")
-            logger.info(f"   ✅ Model is making predictions as expected")
-            
-        finally:
-            os.unlink(temp_file)
-            
     except Exception as e:
         logger.warning(f"⚠️ Endpoint test failed: {e}")
         logger.info("This may be normal if the endpoint is still warming up.")
@@ -567,7 +738,24 @@ def test_hosted_endpoint(ml_client, endpoint_name, deployment_name):
         logger.info("")
         logger.info(f"Try testing manually in a few minutes:")
         logger.info(f"  Endpoint: {endpoint_name}")
-        logger.info(f"  Test data: {json.dumps(test_data, indent=2)}")
+        logger.info(f"  Test data: {json.dumps(_TEST_DATA, indent=2)}")
+
+def _invoke_from_file(ml_client, endpoint_name, deployment_name):
+    """Send the test payload through online_endpoints.invoke, which reads it from a file."""
+    import tempfile
+    
+    with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as f:
+        f.write(_TEST_PAYLOAD)
+        temp_file = f.name
+    
+    try:
+        return ml_client.online_endpoints.invoke(
+            endpoint_name=endpoint_name,
+            request_file=temp_file,
+            deployment_name=deployment_name
+        )
+    finally:
+        os.unlink(temp_file)
 
 def main():
     """Main function for Azure ML Studio hosted endpoint deployment."""
@@ -592,23 +780,27 @@ def main():
         # Get Azure ML client
         ml_client = get_azure_ml_client(config)
         
-        # Create endpoint
-        endpoint = create_optimized_endpoint(ml_client, config)
-        
-        # Create environment
-        environment = create_optimized_environment(ml_client, config)
+        # Create endpoint and environment and stage the server artifacts concurrently
+        # (all independent; the deployment needs every one of them)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            endpoint_future = executor.submit(create_optimized_endpoint, ml_client, config)
+            environment_future = executor.submit(create_optimized_environment, ml_client, config)
+            artifacts_future = executor.submit(prepare_deployment_artifacts)
+            endpoint = endpoint_future.result()
+            environment = environment_future.result()
+            server_dir = artifacts_future.result()
         
         # Create deployment (this is the actual Azure ML Studio hosted server)
-        deployment = create_optimized_deployment(ml_client, config, registration_info, endpoint, environment)
+        deployment = create_optimized_deployment(ml_client, config, registration_info, endpoint, environment, server_dir)
         
         # Configure traffic
-        configure_endpoint_traffic(ml_client, endpoint.name, deployment.name)
+        endpoint = configure_endpoint_traffic(ml_client, endpoint, deployment.name)
         
         # Get and display endpoint details
-        endpoint = get_hosted_endpoint_details(ml_client, config, endpoint.name)
+        endpoint = get_hosted_endpoint_details(ml_client, config, endpoint)
         
         # Test the endpoint
-        test_hosted_endpoint(ml_client, endpoint.name, deployment.name)
+        test_hosted_endpoint(ml_client, endpoint.name, deployment.name, endpoint.scoring_uri)
         
         print("\n🎊 DEPLOYMENT COMPLETED SUCCESSFULLY!")
         print("Your purchase predictor model is now running on Azure ML Studio!")
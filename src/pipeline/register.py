@@ -4,6 +4,7 @@ Registers the trained MLFlow model with Azure ML workspace.
 """
 
 import os
+import re
 import yaml
 import logging
 from azure.ai.ml import MLClient
@@ -11,13 +12,20 @@ from azure.ai.ml.entities import Model
 from azure.identity import DefaultAzureCredential
 import mlflow
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 from config.config_loader import load_config
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Matches a value that is still an unsubstituted ${VARIABLE_NAME} reference
+_UNRESOLVED_ENV_VAR = re.compile(r'\$\{([^}]+)\}')
+
+# Prefer the libyaml-backed C dumper when available
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 def get_azure_ml_client(config):
     """Create and return Azure ML client."""
     subscription_id = config['azure']['subscription_id']
@@ -26,7 +34,7 @@ def get_azure_ml_client(config):
     
     # Validate that variables are properly substituted
     for name, value in [('subscription_id', subscription_id), ('resource_group', resource_group), ('workspace_name', workspace_name)]:
-        if value.startswith('${') and value.endswith('}'):
+        if _UNRESOLVED_ENV_VAR.fullmatch(value):
             raise ValueError(f"Environment variable substitution failed for {name}: {value}")
     
     credential = DefaultAzureCredential()
@@ -134,7 +142,7 @@ def register_model(ml_client, config):
     registration_info_file = config.get('artifacts', {}).get('registration_info_file', 'models/registration_info.yaml')
     
     with open(registration_info_file, 'w') as f:
-        yaml.dump(registration_info, f)
+        yaml.dump(registration_info, f, Dumper=_YamlDumper)
     
     logger.info(f"Registration info saved to {registration_info_file}")
     
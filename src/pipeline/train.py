@@ -14,7 +14,8 @@ from sklearn.metrics import accuracy_score, classification_report, confusion_mat
 import logging
 import joblib
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 from config.config_loader import load_config
 from src.utilities.preprocessing import PurchaseDataPreprocessor, load_processed_data
 
@@ -111,6 +112,35 @@ def evaluate_model(model, X_test, y_test):
         'predictions': y_pred
     }
 
+def export_model_to_onnx(model, n_features, onnx_model_file):
+    """
+    Export the trained model to ONNX so score.py can serve it with ONNX Runtime.
+    
+    Optional step: skipped when skl2onnx is not installed or the conversion fails.
+    """
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError:
+        logger.info("skl2onnx not installed - skipping ONNX export")
+        return None
+    
+    try:
+        # zipmap=False keeps probabilities as a plain (n, n_classes) tensor
+        onnx_model = convert_sklearn(
+            model,
+            initial_types=[('input', FloatTensorType([None, n_features]))],
+            options={id(model): {'zipmap': False}}
+        )
+        with open(onnx_model_file, 'wb') as f:
+            f.write(onnx_model.SerializeToString())
+    except Exception as e:
+        logger.warning(f"ONNX export failed, scoring will use the sklearn model: {e}")
+        return None
+    
+    logger.info(f"Model exported to ONNX at {onnx_model_file}")
+    return onnx_model_file
+
 def save_model_with_mlflow(model, X_train, config, metrics):
     """Save model using MLFlow."""
     logger.info("Saving model with MLFlow...")
@@ -232,6 +262,10 @@ def main():
     joblib.dump(trained_model, local_model_file)
     logger.info(f"Model also saved locally to {local_model_file}")
     
+    # Optional ONNX export for faster inference
+    onnx_model_file = config.get('artifacts', {}).get('onnx_model_file', 'models/model.onnx')
+    export_model_to_onnx(trained_model, X_train.shape[1], onnx_model_file)
+    
     logger.info("Training pipeline completed successfully!")
     logger.info(f"Final model accuracy: {metrics['accuracy']:.4f}")
     logger.info(f"MLFlow run ID: {run_id}")
@@ -6,10 +6,12 @@ This script is used by Azure ML managed online endpoint for inference.
 import json
 import os
 import logging
+import warnings
+import numpy as np
+import orjson
 import pandas as pd
-import mlflow
-import mlflow.sklearn
 import joblib
+from sklearn import config_context
 from preprocessing import PurchaseDataPreprocessor
 
 # Set up logging
@@ -21,7 +23,7 @@ def init():
     Initialize the model for scoring.
     This function is called when the container is initialized/started.
     """
-    global model, preprocessor
+    global model, preprocessor, CAT_MAP, HAS_PROBA, PREDICT, PREDICT_PROBA, CLASSES
     
     logger.info("Initializing model for scoring...")
     
@@ -66,17 +68,38 @@ def init():
         # Load MLFlow model
         mlflow_model_path = os.path.join(model_path, "model")
         if os.path.exists(mlflow_model_path):
+            # mlflow is heavy to import, so only load it when an MLFlow model is present
+            import mlflow.sklearn
             model = mlflow.sklearn.load_model(mlflow_model_path)
             logger.info("MLFlow model loaded successfully")
         else:
             # Fallback to joblib model
             joblib_model_path = os.path.join(model_path, "model.pkl")
             if os.path.exists(joblib_model_path):
-                model = joblib.load(joblib_model_path)
+                # Memory-map the model's arrays read-only so worker processes share pages
+                try:
+                    model = joblib.load(joblib_model_path, mmap_mode='r')
+                except (OSError, ValueError) as mmap_error:
+                    logger.warning(f"Memory-mapped load failed ({mmap_error}), loading into memory")
+                    model = joblib.load(joblib_model_path)
                 logger.info("Joblib model loaded successfully")
             else:
                 raise FileNotFoundError("No model found in the specified path")
         
+        # Bind the methods used in run()
+        HAS_PROBA = hasattr(model, 'predict_proba')
+        PREDICT = model.predict
+        PREDICT_PROBA = model.predict_proba if HAS_PROBA else None
+        CLASSES = getattr(model, 'classes_', None)
+        
+        # Prefer an ONNX export of the model when one sits next to it
+        onnx_model_path = os.path.join(model_path, "model.onnx")
+        if HAS_PROBA and CLASSES is not None and os.path.exists(onnx_model_path):
+            onnx_predict_proba = _load_onnx_predict_proba(onnx_model_path)
+            if onnx_predict_proba is not None:
+                PREDICT_PROBA = onnx_predict_proba
+                logger.info(f"ONNX Runtime session loaded from {onnx_model_path}")
+        
         # Load fitted preprocessor
         logger.info("Attempting to load fitted preprocessor...")
         try:
@@ -88,6 +111,16 @@ def init():
             # Create a basic preprocessor instance for fallback
             preprocessor = None
             logger.info("Will use fallback preprocessing for all requests")
+        
+        # Category -> code lookup for the NumPy fast path (None disables it for raw input)
+        try:
+            CAT_MAP = preprocessor.get_category_mapping()
+        except AttributeError:
+            CAT_MAP = None  # No preprocessor, or its encoder was never fitted
+        
+        # The fast path passes plain ndarrays; don't warn on every request that a
+        # model fitted on a DataFrame received no feature names
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
             
     except Exception as e:
         logger.error(f"Error loading model: {str(e)}")
@@ -95,6 +128,32 @@ def init():
     
     logger.info("Model initialization completed successfully")
 
+def _load_onnx_predict_proba(onnx_model_path):
+    """
+    Build a predict_proba replacement backed by ONNX Runtime.
+    
+    Returns None when onnxruntime is not installed or the model has no
+    probabilities output, in which case the sklearn model is used.
+    """
+    try:
+        import onnxruntime
+    except ImportError:
+        logger.info("onnxruntime not installed - scoring with the sklearn model")
+        return None
+    
+    session = onnxruntime.InferenceSession(onnx_model_path, providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    if 'probabilities' not in [output.name for output in session.get_outputs()]:
+        logger.warning("ONNX model has no probabilities output - scoring with the sklearn model")
+        return None
+    
+    session_run = session.run
+    
+    def predict_proba(X):
+        return session_run(['probabilities'], {input_name: np.asarray(X, dtype=np.float32)})[0]
+    
+    return predict_proba
+
 def run(raw_data):
     """
     Make predictions on the input data.
@@ -106,11 +165,11 @@ def run(raw_data):
         str: JSON string containing predictions
     """
     try:
-        logger.info("Processing prediction request...")
+        logger.debug("Processing prediction request...")
         
         # Parse input data
-        data = json.loads(raw_data)
-        logger.info(f"Received data: {data}")
+        data = orjson.loads(raw_data)
+        logger.debug("Received data: %s", data)
         
         # Convert to DataFrame for processing
         if 'data' in data:
@@ -120,40 +179,20 @@ def run(raw_data):
             # Handle direct array input
             input_data = data
         
-        # Convert to DataFrame
-        df = pd.DataFrame(input_data)
+        # Build the whole batch as one feature matrix
+        X = _build_features(input_data)
         
-        # Handle different input formats - detect by content, not just shape
-        if df.shape[1] == 4:
-            # Check if this is raw or preprocessed data by looking at data types
-            # If we have string data in columns 2 or 3, it's raw input
-            has_string_data = (
-                df.iloc[:, 2].dtype == 'object' or  # category column
-                df.iloc[:, 3].dtype == 'object'     # previously_purchased column
-            )
-            
-            if has_string_data:
-                # Raw input: [price, user_rating, category, previously_purchased]
-                feature_names = ['price', 'user_rating', 'category', 'previously_purchased']
-                df.columns = feature_names
-                df = preprocess_raw_input(df)
+        # Make predictions; classifiers derive labels from a single predict_proba pass.
+        # sklearn's config is thread-local, so it is set here in the thread serving the
+        # request. The NumPy fast path only yields finite values (JSON has no NaN/inf),
+        # so its finiteness scan is skipped; DataFrame input keeps the check.
+        with config_context(assume_finite=isinstance(X, np.ndarray), skip_parameter_validation=True):
+            if HAS_PROBA and CLASSES is not None:
+                probabilities = PREDICT_PROBA(X)
+                predictions = CLASSES[np.argmax(probabilities, axis=1)]
             else:
-                # Preprocessed input: [price, user_rating, category_encoded, previously_purchased_encoded]
-                feature_names = ['price', 'user_rating', 'category_encoded', 'previously_purchased_encoded']
-                df.columns = feature_names
-        elif df.shape[1] == 5 and 'label' not in df.columns:
-            # Raw input: [price, user_rating, category, previously_purchased, extra_column]
-            feature_names = ['price', 'user_rating', 'category', 'previously_purchased', 'extra']
-            df.columns = feature_names
-            df = preprocess_raw_input(df)
-        else:
-            # Handle named columns
-            if 'category' in df.columns and 'category_encoded' not in df.columns:
-                df = preprocess_raw_input(df)
-        
-        # Make predictions
-        predictions = model.predict(df)
-        probabilities = model.predict_proba(df) if hasattr(model, 'predict_proba') else None
+                predictions = PREDICT(X)
+                probabilities = PREDICT_PROBA(X) if HAS_PROBA else None
         
         # Format response
         response = {
@@ -161,19 +200,128 @@ def run(raw_data):
         }
         
         if probabilities is not None:
-            response['probabilities'] = probabilities.tolist()
+            if isinstance(data, dict) and data.get('probability_format') == 'float16_hex':
+                # Opt-in compact form: little-endian float16 bytes, hex-encoded, plus the shape
+                response['probabilities'] = probabilities.astype('<f2').tobytes().hex()
+                response['probability_shape'] = list(probabilities.shape)
+            else:
+                response['probabilities'] = probabilities.tolist()
         
-        logger.info(f"Generated predictions: {response}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated predictions: %s", response)
         return response  # Return Python dict, not JSON string
         
     except Exception as e:
-        logger.error(f"Error during prediction: {str(e)}")
+        logger.error("Error during prediction: %s", e)
         error_response = {
             'error': str(e),
             'message': 'Prediction failed'
         }
         return error_response  # Return Python dict, not JSON string
 
+def _build_features(input_data):
+    """
+    Single dispatch from parsed request rows to the model input for the whole batch.
+    
+    Plain list-of-lists input is converted with NumPy alone; anything else
+    (named columns, missing values, unknown categories) uses the DataFrame path.
+    """
+    X = _numpy_features(input_data)
+    if X is None:
+        X = _dataframe_features(input_data)
+    return X
+
+def _numpy_features(input_data):
+    """
+    Build the feature matrix for list-of-lists input without pandas.
+    
+    Produces the same values as the DataFrame path for its common cases and
+    returns None whenever the input needs that path instead.
+    
+    Args:
+        input_data: Parsed request rows
+        
+    Returns:
+        np.ndarray or None: (n, 4) float64 feature matrix in Fortran order
+    """
+    try:
+        arr = np.array(input_data)
+    except ValueError:
+        return None  # Ragged rows
+    if arr.ndim == 1 and arr.dtype != object:
+        # A single flat row, e.g. {"data": [25.99, 4, 0, 1]}
+        arr = arr.reshape(1, -1)
+        input_data = [input_data]
+    if arr.ndim != 2:
+        return None
+    
+    n_rows, n_cols = arr.shape
+    if arr.dtype.kind in 'biuf':
+        # Preprocessed input: [price, user_rating, category_encoded, previously_purchased_encoded]
+        return arr.astype(np.float64, order='F') if n_cols == 4 else None
+    
+    if CAT_MAP is None or n_cols not in (4, 5):
+        return None
+    
+    # Raw input: [price, user_rating, category, previously_purchased(, extra)]
+    rows = np.array(input_data, dtype=object)
+    if pd.isna(rows).any():
+        return None  # The preprocessor drops incomplete rows
+    
+    try:
+        category_codes = [CAT_MAP[category] for category in rows[:, 2]]
+        numeric = rows[:, :2].astype(np.float64)
+    except (KeyError, TypeError, ValueError):
+        return None  # Unknown category or non-numeric price/rating
+    if not np.isfinite(numeric).all():
+        return None  # e.g. "nan" strings; left to the DataFrame path's checks
+    
+    purchased = rows[:, 3] == 'yes'
+    if not (purchased | (rows[:, 3] == 'no')).all():
+        return None
+    
+    # Column-major so each feature column is written (and read by sklearn) contiguously
+    X = np.empty((n_rows, 4), dtype=np.float64, order='F')
+    X[:, :2] = numeric
+    X[:, 2] = category_codes
+    X[:, 3] = purchased
+    return X
+
+def _dataframe_features(input_data):
+    """Build the model input through pandas, detecting raw vs preprocessed columns."""
+    # Convert to DataFrame
+    df = pd.DataFrame(input_data)
+    
+    # Handle different input formats - detect by content, not just shape
+    if df.shape[1] == 4:
+        # Check if this is raw or preprocessed data by looking at data types
+        # If we have string data in columns 2 or 3, it's raw input
+        has_string_data = (
+            df.iloc[:, 2].dtype == 'object' or  # category column
+            df.iloc[:, 3].dtype == 'object'     # previously_purchased column
+        )
+        
+        if has_string_data:
+            # Raw input: [price, user_rating, category, previously_purchased]
+            feature_names = ['price', 'user_rating', 'category', 'previously_purchased']
+            df.columns = feature_names
+            df = preprocess_raw_input(df)
+        else:
+            # Preprocessed input: [price, user_rating, category_encoded, previously_purchased_encoded]
+            feature_names = ['price', 'user_rating', 'category_encoded', 'previously_purchased_encoded']
+            df.columns = feature_names
+    elif df.shape[1] == 5 and 'label' not in df.columns:
+        # Raw input: [price, user_rating, category, previously_purchased, extra_column]
+        feature_names = ['price', 'user_rating', 'category', 'previously_purchased', 'extra']
+        df.columns = feature_names
+        df = preprocess_raw_input(df)
+    else:
+        # Handle named columns
+        if 'category' in df.columns and 'category_encoded' not in df.columns:
+            df = preprocess_raw_input(df)
+    
+    return df
+
 def preprocess_raw_input(df):
     """
     Preprocess raw input data using shared preprocessor.
@@ -184,10 +332,12 @@ def preprocess_raw_input(df):
     Returns:
         pd.DataFrame: Preprocessed DataFrame ready for model
     """
-    logger.info("Preprocessing raw input data using shared preprocessor...")
-    logger.info(f"Input DataFrame shape: {df.shape}")
-    logger.info(f"Input DataFrame columns: {list(df.columns)}")
-    logger.info(f"Input DataFrame sample: {df.head().to_dict('records') if len(df) > 0 else 'No data'}")
+    # Per-request diagnostics; the samples are only built when DEBUG is enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Preprocessing raw input data using shared preprocessor...")
+        logger.debug("Input DataFrame shape: %s", df.shape)
+        logger.debug("Input DataFrame columns: %s", list(df.columns))
+        logger.debug("Input DataFrame sample: %s", df.head().to_dict('records') if len(df) > 0 else 'No data')
     
     # If preprocessor failed to load, go straight to fallback
     if preprocessor is None:
@@ -197,20 +347,21 @@ def preprocess_raw_input(df):
     try:
         # Use shared preprocessor for consistent transformation
         processed_features = preprocessor.transform_inference_data(df)
-        logger.info(f"Preprocessed features shape: {processed_features.shape}")
-        logger.info(f"Preprocessed features columns: {list(processed_features.columns)}")
-        logger.info(f"Preprocessed sample: {processed_features.head().to_dict('records') if len(processed_features) > 0 else 'No data'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Preprocessed features shape: %s", processed_features.shape)
+            logger.debug("Preprocessed features columns: %s", list(processed_features.columns))
+            logger.debug("Preprocessed sample: %s", processed_features.head().to_dict('records') if len(processed_features) > 0 else 'No data')
         
         # Check for NaN values
         nan_counts = processed_features.isnull().sum()
         if nan_counts.any():
-            logger.error(f"NaN values found after preprocessing: {nan_counts.to_dict()}")
+            logger.error("NaN values found after preprocessing: %s", nan_counts.to_dict())
             logger.error("Falling back to manual preprocessing")
             return _fallback_preprocessing(df)
         
         return processed_features
     except Exception as e:
-        logger.error(f"Preprocessing error: {str(e)}")
+        logger.error("Preprocessing error: %s", e)
         logger.error("Falling back to manual preprocessing")
         # Fallback to basic preprocessing if shared preprocessor fails
         return _fallback_preprocessing(df)
@@ -238,9 +389,13 @@ def _fallback_preprocessing(df):
     
     # Handle previously_purchased encoding
     if 'previously_purchased' in processed_df.columns:
-        processed_df['previously_purchased_encoded'] = processed_df['previously_purchased'].map({'yes': 1, 'no': 0})
-        # Handle unknown values by setting to 0 (no)
-        processed_df['previously_purchased_encoded'] = processed_df['previously_purchased_encoded'].fillna(0)
+        purchased = processed_df['previously_purchased']
+        is_yes = purchased.eq('yes')
+        unknown = ~(is_yes | purchased.eq('no'))
+        if unknown.any():
+            # Unknown values count as 0 (no), but are reported rather than silently absorbed
+            logger.warning("Unexpected previously_purchased values encoded as 'no': %s", list(purchased[unknown].unique()))
+        processed_df['previously_purchased_encoded'] = is_yes.astype(np.int8)
     
     # Ensure all numeric columns are properly typed
     for col in ['price', 'user_rating', 'category_encoded', 'previously_purchased_encoded']:
@@ -251,9 +406,10 @@ def _fallback_preprocessing(df):
     feature_columns = ['price', 'user_rating', 'category_encoded', 'previously_purchased_encoded']
     result_df = processed_df[feature_columns]
     
-    logger.info(f"Fallback preprocessing result shape: {result_df.shape}")
-    logger.info(f"Fallback preprocessing result columns: {list(result_df.columns)}")
-    logger.info(f"Sample values: {result_df.iloc[0].to_dict() if len(result_df) > 0 else 'No data'}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Fallback preprocessing result shape: %s", result_df.shape)
+        logger.debug("Fallback preprocessing result columns: %s", list(result_df.columns))
+        logger.debug("Sample values: %s", result_df.iloc[0].to_dict() if len(result_df) > 0 else 'No data')
     
     return result_df
 
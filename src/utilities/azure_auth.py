@@ -0,0 +1,106 @@
+"""
+Shared Azure authentication utilities for purchase predictor pipeline scripts.
+Provides one process-wide credential whose access tokens are cached in memory
+(and, for a service principal, on disk across runs).
+"""
+
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tokens are refreshed this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 60
+
+# Name of the persistent token cache shared by service principal runs
+TOKEN_CACHE_NAME = "purchase_predictor"
+
+_CREDENTIAL = None
+_CREDENTIAL_LOCK = threading.Lock()
+
+class CachedTokenCredential:
+    """
+    Wrap an Azure TokenCredential and reuse each token until shortly before it expires.
+
+    Every MLClient service client runs its own authentication policy, and
+    DefaultAzureCredential's Azure CLI fallback spawns an `az` process per
+    get_token call. Sharing one token per scope avoids those repeated launches.
+    """
+
+    def __init__(self, credential, refresh_margin=TOKEN_REFRESH_MARGIN):
+        self._credential = credential
+        self._refresh_margin = refresh_margin
+        self._tokens = {}  # (scopes, options) -> AccessToken
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes, **kwargs):
+        """Return a cached token for the scopes, fetching a new one when it is near expiry."""
+        # Claims challenges must always reach the real credential
+        if kwargs.get('claims'):
+            return self._credential.get_token(*scopes, **kwargs)
+
+        key = (scopes, tuple(sorted(kwargs.items())))
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None or token.expires_on - self._refresh_margin <= time.time():
+                token = self._tokens[key] = self._credential.get_token(*scopes, **kwargs)
+        return token
+
+    def close(self):
+        """Close the wrapped credential."""
+        close = getattr(self._credential, 'close', None)
+        if close is not None:
+            close()
+
+def _create_credential():
+    """Build the underlying credential: a configured service principal, else DefaultAzureCredential."""
+    tenant_id = os.environ.get('AZURE_TENANT_ID')
+    client_id = os.environ.get('AZURE_CLIENT_ID')
+    client_secret = os.environ.get('AZURE_CLIENT_SECRET')
+    
+    if tenant_id and client_id and client_secret:
+        from azure.identity import ClientSecretCredential, TokenCachePersistenceOptions
+        
+        # Use the service principal directly instead of probing the whole credential chain,
+        # with its tokens in a persistent cache so later runs skip authentication.
+        # The cache is encrypted where the OS supports it; on Linux hosts without
+        # libsecret (CI agents, containers) it falls back to a file in the user's
+        # profile instead of failing on the first get_token call.
+        logger.info("Using service principal credential from AZURE_CLIENT_ID with persistent token cache")
+        return ClientSecretCredential(
+            tenant_id,
+            client_id,
+            client_secret,
+            cache_persistence_options=TokenCachePersistenceOptions(
+                name=TOKEN_CACHE_NAME,
+                allow_unencrypted_storage=True
+            )
+        )
+    
+    from azure.identity import DefaultAzureCredential
+    
+    # Skip credential types this pipeline never uses so their probes don't run
+    # (authentication comes from az login, a service principal or a managed identity)
+    return DefaultAzureCredential(
+        exclude_interactive_browser_credential=True,
+        exclude_visual_studio_code_credential=True
+    )
+
+def get_credential():
+    """
+    Return the process-wide Azure credential, creating it on first use.
+
+    Returns:
+        CachedTokenCredential: the service principal from AZURE_TENANT_ID,
+        AZURE_CLIENT_ID and AZURE_CLIENT_SECRET when all are set (tokens also
+        cached on disk), otherwise DefaultAzureCredential, with in-memory token caching
+    """
+    global _CREDENTIAL
+    if _CREDENTIAL is None:
+        with _CREDENTIAL_LOCK:
+            if _CREDENTIAL is None:
+                _CREDENTIAL = CachedTokenCredential(_create_credential())
+                logger.info("Created shared Azure credential with in-memory token cache")
+    return _CREDENTIAL
@@ -4,6 +4,9 @@ Debug script to test configuration loading and region settings.
 """
 
 import json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 from config.config_loader import load_config
 
 def debug_config_loading():
@@ -30,12 +33,15 @@ def debug_config_loading():
         print(f"   deployment section content: {deployment_section}")
         print()
         
+        # Read the region once; the checks below reuse these locals
+        has_deployment = 'deployment' in config
+        has_region = 'region' in deployment_section
+        region_raw = deployment_section.get('region')
+        region_stripped = region_raw.strip() if region_raw else ''
+        
         print("🌍 Region configuration analysis:")
-        if 'deployment' in config:
-            region_raw = config['deployment'].get('region')
-            region_stripped = config['deployment'].get('region', '').strip() if region_raw else ''
-            
-            print(f"   region key exists: {'region' in config['deployment']}")
+        if has_deployment:
+            print(f"   region key exists: {has_region}")
             print(f"   region raw value: '{region_raw}'")
             print(f"   region raw type: {type(region_raw)}")
             print(f"   region stripped: '{region_stripped}'")
@@ -47,15 +53,15 @@ def debug_config_loading():
         print()
         
         print("💡 Diagnosis:")
-        if 'deployment' not in config:
+        if not has_deployment:
             print("   ❌ Missing 'deployment' section in config.yaml")
-        elif 'region' not in config['deployment']:
+        elif not has_region:
             print("   ❌ Missing 'region' key in deployment section")
-        elif not config['deployment'].get('region', '').strip():
+        elif not region_stripped:
             print("   ❌ Region value is empty, None, or whitespace")
             print("   🔧 This explains why deployment goes to workspace region (centralus)")
         else:
-            region = config['deployment']['region'].strip()
+            region = region_stripped
             print(f"   ✅ Region is properly configured: '{region}'")
             if region.lower() == 'eastus':
                 print("   ✅ Region is set to East US as expected")
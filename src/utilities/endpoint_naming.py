@@ -3,14 +3,33 @@ Unique endpoint name generation utilities for Azure ML deployments.
 Handles endpoint naming best practices and retry logic for robust deployments.
 """
 
+import re
 import datetime
 import uuid
 import time
+import random
 import logging
 from typing import Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Characters allowed in Azure ML endpoint and deployment names
+_VALID_NAME_CHARS = re.compile(r'^[a-z0-9-]+$')
+
+# First retry backoff in seconds; doubles per attempt up to the caller's retry_delay
+RETRY_BASE_DELAY = 30
+
+# Responses worth retrying in place (request timeout, throttling and transient server
+# errors), and the attempt count / backoff bounds in seconds for those retries
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+TRANSIENT_MAX_ATTEMPTS = 5
+TRANSIENT_INITIAL_DELAY = 2
+TRANSIENT_MAX_DELAY = 60
+
+# Polling for an endpoint left Creating/Updating by a failed attempt: interval and limit in seconds
+ENDPOINT_SETTLE_POLL_INTERVAL = 30
+ENDPOINT_SETTLE_TIMEOUT = 1800
+
 def generate_unique_endpoint_name(base_name="purchase-predictor", max_length=32) -> str:
     """
     Generate a unique endpoint name that complies with Azure ML requirements.
@@ -88,6 +107,96 @@ def generate_unique_deployment_name(base_name="purchase-predictor-deployment", m
     logger.info(f"Generated unique deployment name: {candidate_name}")
     return candidate_name
 
+def retry_backoff_delay(retry_count: int, max_delay: float, base_delay: float = RETRY_BASE_DELAY) -> float:
+    """
+    Exponential backoff with jitter for the create-retry loops.
+    
+    The delay doubles per attempt from base_delay, is capped at max_delay, and is
+    drawn from the upper half of that window so concurrent pipelines don't retry
+    in lockstep.
+    
+    Args:
+        retry_count: Zero-based number of the attempt that just failed
+        max_delay: Longest delay in seconds
+        base_delay: Delay ceiling in seconds for the first retry
+    
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    delay = min(max_delay, base_delay * 2 ** retry_count)
+    return random.uniform(delay / 2, delay)
+
+def with_transient_retry(operation, description):
+    """
+    Run operation(), retrying throttled and transient Azure failures.
+    
+    HTTP responses with a TRANSIENT_STATUS_CODES status and connection failures
+    (ServiceRequestError / ServiceResponseError) are retried. Waits for the
+    response's Retry-After when the service sends one, otherwise backs off
+    exponentially with jitter. Other errors are raised immediately.
+    Wrap a single call with this, not a loop that already retries, so the
+    attempt counts don't multiply.
+    
+    Args:
+        operation: Zero-argument callable making the Azure call
+        description: Label for the call in retry log messages
+    
+    Returns:
+        Whatever operation() returns
+    """
+    for attempt in range(TRANSIENT_MAX_ATTEMPTS):
+        try:
+            return operation()
+        except Exception as e:
+            if not _is_transient_error(e) or attempt == TRANSIENT_MAX_ATTEMPTS - 1:
+                raise
+            response = getattr(e, 'response', None)
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            if retry_after and retry_after.isdigit():
+                delay = int(retry_after)
+            else:
+                backoff = min(TRANSIENT_MAX_DELAY, TRANSIENT_INITIAL_DELAY * 2 ** attempt)
+                delay = backoff + random.uniform(0, backoff)
+            status = getattr(e, 'status_code', None)
+            reason = f"returned HTTP {status}" if status else f"connection failed ({type(e).__name__})"
+            logger.warning(f"⚠️ {description} {reason}; "
+                           f"retrying in {delay:.0f}s (attempt {attempt + 2}/{TRANSIENT_MAX_ATTEMPTS})")
+            time.sleep(delay)
+
+def _is_transient_error(error) -> bool:
+    """True for the connection failures and HTTP statuses with_transient_retry retries."""
+    from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+    
+    if isinstance(error, (ServiceRequestError, ServiceResponseError)):
+        return True
+    return isinstance(error, HttpResponseError) and error.status_code in TRANSIENT_STATUS_CODES
+
+def _created_by_this_run(endpoint, endpoint_config) -> bool:
+    """True when the endpoint carries every tag of endpoint_config (including its 'created' timestamp)."""
+    expected = endpoint_config.tags or {}
+    actual = endpoint.tags or {}
+    return bool(expected) and all(actual.get(key) == str(value) for key, value in expected.items())
+
+def _wait_for_endpoint_to_settle(ml_client, endpoint, timeout=ENDPOINT_SETTLE_TIMEOUT,
+                                 poll_interval=ENDPOINT_SETTLE_POLL_INTERVAL):
+    """
+    Poll an endpoint that is still Creating/Updating until it reaches another state.
+    
+    Returns:
+        The latest endpoint object (still in progress if the timeout ran out),
+        or None if the endpoint disappeared while waiting
+    """
+    deadline = time.monotonic() + timeout
+    while endpoint.provisioning_state in ("Creating", "Updating") and time.monotonic() < deadline:
+        logger.info(f"⏳ Endpoint {endpoint.name} is {endpoint.provisioning_state}; "
+                    f"checking again in {poll_interval} seconds...")
+        time.sleep(poll_interval)
+        try:
+            endpoint = ml_client.online_endpoints.get(endpoint.name)
+        except Exception:
+            return None
+    return endpoint
+
 def create_endpoint_with_cleanup_retry(ml_client, endpoint_config, max_retries=3, retry_delay=300) -> any:
     """
     Create endpoint with comprehensive cleanup and retry logic.
@@ -96,7 +205,7 @@ def create_endpoint_with_cleanup_retry(ml_client, endpoint_config, max_retries=3
         ml_client: Azure ML client instance
         endpoint_config: ManagedOnlineEndpoint configuration object
         max_retries: Maximum number of retry attempts (default: 3)
-        retry_delay: Delay between retries in seconds (default: 300 = 5 minutes)
+        retry_delay: Longest delay between retries in seconds (default: 300 = 5 minutes)
     
     Returns:
         Successfully created endpoint object
@@ -112,7 +221,11 @@ def create_endpoint_with_cleanup_retry(ml_client, endpoint_config, max_retries=3
             logger.info(f"Attempting to create endpoint: {endpoint_config.name} (attempt {retry_count + 1})")
             
             # Try to create the endpoint
-            result = ml_client.online_endpoints.begin_create_or_update(endpoint_config).result()
+            # Throttling and transient ARM errors are retried in place under the same name
+            result = with_transient_retry(
+                lambda: ml_client.online_endpoints.begin_create_or_update(endpoint_config).result(),
+                "Endpoint creation"
+            )
             logger.info(f"✅ Successfully created endpoint: {endpoint_config.name}")
             return result
             
@@ -130,7 +243,10 @@ def create_endpoint_with_cleanup_retry(ml_client, endpoint_config, max_retries=3
                 "timeout"
             ]
             
-            is_retryable = any(err in error_msg for err in retryable_errors)
+            # Throttling/transient errors were already retried by with_transient_retry;
+            # retrying them again here would multiply the attempts
+            is_retryable = (not _is_transient_error(e)
+                            and any(err in error_msg for err in retryable_errors))
             
             if not is_retryable or retry_count >= max_retries:
                 logger.error(f"Non-retryable error or max retries exceeded: {e}")
@@ -140,17 +256,42 @@ def create_endpoint_with_cleanup_retry(ml_client, endpoint_config, max_retries=3
             logger.info(f"⚠️ Retryable error detected. Initiating cleanup and retry...")
             
             try:
-                # Try to cleanup any orphaned endpoint
-                logger.info(f"🧹 Attempting to cleanup endpoint: {endpoint_config.name}")
-                ml_client.online_endpoints.begin_delete(endpoint_config.name).wait()
-                logger.info(f"✅ Cleanup completed for: {endpoint_config.name}")
-            except Exception as cleanup_error:
-                logger.warning(f"⚠️ Cleanup failed (continuing anyway): {cleanup_error}")
+                existing = ml_client.online_endpoints.get(endpoint_config.name)
+            except Exception:
+                existing = None
+            
+            # An endpoint still provisioning may yet succeed, so wait for it rather than deleting it
+            waited = False
+            if existing is not None and existing.provisioning_state in ("Creating", "Updating"):
+                existing = _wait_for_endpoint_to_settle(ml_client, existing)
+                waited = True
+            
+            # This run's endpoint is used as-is if it provisioned despite the error, and deleted
+            # if it failed; an endpoint of the same name from elsewhere is never touched
+            own_endpoint = existing is not None and _created_by_this_run(existing, endpoint_config)
+            if own_endpoint and existing.provisioning_state == "Succeeded":
+                logger.info(f"✅ Endpoint {existing.name} is already provisioned, using it")
+                return existing
+            if existing is not None and not own_endpoint:
+                logger.warning(f"⚠️ Endpoint {existing.name} was not created by this run; leaving it untouched")
+            
+            cleaned_up = False
+            if own_endpoint and existing.provisioning_state == "Failed":
+                try:
+                    # Delete the failed endpoint; result() returns once ARM reports the delete finished
+                    logger.info(f"🧹 Attempting to cleanup endpoint: {endpoint_config.name}")
+                    ml_client.online_endpoints.begin_delete(endpoint_config.name).result()
+                    logger.info(f"✅ Cleanup completed for: {endpoint_config.name}")
+                    cleaned_up = True
+                except Exception as cleanup_error:
+                    logger.warning(f"⚠️ Cleanup failed (continuing anyway): {cleanup_error}")
             
-            # Wait before retry
+            # Wait before retry, unless a cleanup or the provisioning wait already took that time
             if retry_count < max_retries:
-                logger.info(f"⏳ Waiting {retry_delay} seconds before retry...")
-                time.sleep(retry_delay)
+                if not (cleaned_up or waited):
+                    delay = retry_backoff_delay(retry_count, retry_delay)
+                    logger.info(f"⏳ Waiting {delay:.0f} seconds before retry...")
+                    time.sleep(delay)
                 
                 # Generate new unique name for retry
                 retry_suffix = f"retry{retry_count + 1}-{int(time.time() % 10000)}"
@@ -175,7 +316,7 @@ def create_deployment_with_retry(ml_client, deployment_config, max_retries=2, re
         ml_client: Azure ML client instance
         deployment_config: ManagedOnlineDeployment configuration object
         max_retries: Maximum number of retry attempts (default: 2)
-        retry_delay: Delay between retries in seconds (default: 180 = 3 minutes)
+        retry_delay: Longest delay between retries in seconds (default: 180 = 3 minutes)
     
     Returns:
         Successfully created deployment object
@@ -187,7 +328,11 @@ def create_deployment_with_retry(ml_client, deployment_config, max_retries=2, re
         try:
             logger.info(f"Attempting to create deployment: {deployment_config.name} (attempt {retry_count + 1})")
             
-            result = ml_client.online_deployments.begin_create_or_update(deployment_config).result()
+            # Throttling and transient ARM errors are retried in place under the same name
+            result = with_transient_retry(
+                lambda: ml_client.online_deployments.begin_create_or_update(deployment_config).result(),
+                "Deployment creation"
+            )
             logger.info(f"✅ Successfully created deployment: {deployment_config.name}")
             return result
             
@@ -203,7 +348,10 @@ def create_deployment_with_retry(ml_client, deployment_config, max_retries=2, re
                 "provisioning failed"
             ]
             
-            is_retryable = any(err in error_msg for err in retryable_errors)
+            # Throttling/transient errors were already retried by with_transient_retry;
+            # retrying them again here would multiply the attempts
+            is_retryable = (not _is_transient_error(e)
+                            and any(err in error_msg for err in retryable_errors))
             
             if not is_retryable or retry_count >= max_retries:
                 logger.error(f"Non-retryable error or max retries exceeded: {e}")
@@ -211,8 +359,9 @@ def create_deployment_with_retry(ml_client, deployment_config, max_retries=2, re
             
             # Wait and retry with new name
             if retry_count < max_retries:
-                logger.info(f"⏳ Waiting {retry_delay} seconds before retry...")
-                time.sleep(retry_delay)
+                delay = retry_backoff_delay(retry_count, retry_delay)
+                logger.info(f"⏳ Waiting {delay:.0f} seconds before retry...")
+                time.sleep(delay)
                 
                 # Generate new deployment name
                 retry_suffix = f"r{retry_count + 1}-{int(time.time() % 1000)}"
@@ -251,8 +400,7 @@ def validate_azure_ml_name(name: str, name_type: str = "endpoint") -> Tuple[bool
         return False, f"{name_type} name must start and end with alphanumeric character"
     
     # Check for valid characters (lowercase letters, numbers, hyphens)
-    import re
-    if not re.match(r'^[a-z0-9-]+$', name):
+    if not _VALID_NAME_CHARS.match(name):
         return False, f"{name_type} name can only contain lowercase letters, numbers, and hyphens"
     
     # Check for consecutive hyphens
@@ -283,7 +431,7 @@ def create_regional_endpoint_config(endpoint_name: str, config: dict, descriptio
             'project': 'purchase-predictor',
             'environment': 'production',
             'deployment_type': 'managed_endpoint_regional',
-            'created': time.strftime("%Y-%m-%d_%H-%M-%S")
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
         }
     }
     
@@ -7,6 +7,7 @@ import os
 import json
 import logging
 import sys
+from pathlib import Path
 import joblib
 import pandas as pd
 from flask import Flask, request, jsonify
@@ -14,7 +15,7 @@ import numpy as np
 from datetime import datetime
 
 # Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 from src.utilities.preprocessing import PurchaseDataPreprocessor
 from config.config_loader import load_config
 
@@ -4,6 +4,8 @@ Ensures consistency between data preparation and training phases.
 """
 
 import os
+import json
+import numpy as np
 import pandas as pd
 import joblib
 from sklearn.preprocessing import LabelEncoder
@@ -11,6 +13,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Column types of processed CSVs written without a dtypes sidecar (float feature
+# mode), so reloads skip pandas' type inference
+PROCESSED_DTYPES = {
+    'price': np.float64,
+    'user_rating': np.float64,
+    'category_encoded': np.float64,
+    'previously_purchased_encoded': np.float64,
+    'label': np.int64
+}
+
 
 class PurchaseDataPreprocessor:
     """Handles all preprocessing operations for purchase prediction data."""
@@ -30,6 +42,7 @@ class PurchaseDataPreprocessor:
         self.handle_missing = handle_missing
         self.use_float_types = use_float_types
         self.drop_threshold = drop_threshold
+        self._category_map = None  # (encoder classes_, {category: code})
     
     def fit_transform_training_data(self, df):
         """
@@ -43,13 +56,12 @@ class PurchaseDataPreprocessor:
             tuple: (X_train, y_train) - features and target
         """
         logger.info("Fitting preprocessor on training data...")
-        processed_df = df.copy()
         
         # Handle missing data according to strategy
         if self.handle_missing == 'drop':
-            initial_rows = len(processed_df)
-            processed_df = processed_df.dropna()
-            dropped_rows = initial_rows - len(processed_df)
+            initial_rows = len(df)
+            df = self._drop_incomplete_rows(df)
+            dropped_rows = initial_rows - len(df)
             
             if dropped_rows > 0:
                 logger.info(f"Dropped {dropped_rows} rows with missing values ({dropped_rows/initial_rows*100:.1f}% of data)")
@@ -58,18 +70,10 @@ class PurchaseDataPreprocessor:
             logger.info("Imputation strategy not yet implemented, proceeding with existing data")
         
         # Encode categorical variables - fit on training data
-        processed_df['category_encoded'] = self.le_category.fit_transform(processed_df['category'])
+        category_encoded = self.le_category.fit_transform(df['category'])
         logger.info(f"Category encoder fitted with classes: {list(self.le_category.classes_)}")
         
-        # Convert previously_purchased to binary
-        processed_df['previously_purchased_encoded'] = processed_df['previously_purchased'].map({'yes': 1, 'no': 0})
-        
-        # Convert to appropriate types for MLFlow compatibility
         if self.use_float_types:
-            processed_df['category_encoded'] = processed_df['category_encoded'].astype('float64')
-            processed_df['previously_purchased_encoded'] = processed_df['previously_purchased_encoded'].astype('float64')
-            processed_df['price'] = processed_df['price'].astype('float64')
-            processed_df['user_rating'] = processed_df['user_rating'].astype('float64')
             logger.info("Using float64 types for MLFlow compatibility")
         else:
             logger.info("Using integer types for encoded features")
@@ -77,7 +81,7 @@ class PurchaseDataPreprocessor:
         # Save encoder for later use (training, inference, deployment)
         self._save_encoders()
         
-        return self._extract_features_target(processed_df)
+        return self._extract_features_target(df, category_encoded)
     
     def transform_test_data(self, df):
         """
@@ -90,31 +94,20 @@ class PurchaseDataPreprocessor:
             tuple: (X_test, y_test) - features and target
         """
         logger.info("Transforming test data using fitted preprocessor...")
-        processed_df = df.copy()
         
         # Handle missing data consistently with training
         if self.handle_missing == 'drop':
-            initial_rows = len(processed_df)
-            processed_df = processed_df.dropna()
-            dropped_rows = initial_rows - len(processed_df)
+            initial_rows = len(df)
+            df = self._drop_incomplete_rows(df)
+            dropped_rows = initial_rows - len(df)
             
             if dropped_rows > 0:
                 logger.warning(f"Dropped {dropped_rows} test rows with missing values")
         
         # Use already fitted encoder (no fitting on test data)
-        processed_df['category_encoded'] = self.le_category.transform(processed_df['category'])
-        
-        # Convert previously_purchased to binary
-        processed_df['previously_purchased_encoded'] = processed_df['previously_purchased'].map({'yes': 1, 'no': 0})
-        
-        # Apply same type conversions as training
-        if self.use_float_types:
-            processed_df['category_encoded'] = processed_df['category_encoded'].astype('float64')
-            processed_df['previously_purchased_encoded'] = processed_df['previously_purchased_encoded'].astype('float64')
-            processed_df['price'] = processed_df['price'].astype('float64')
-            processed_df['user_rating'] = processed_df['user_rating'].astype('float64')
+        category_encoded = self._encode_categories(df['category'])
         
-        return self._extract_features_target(processed_df)
+        return self._extract_features_target(df, category_encoded)
     
     def transform_inference_data(self, df):
         """
@@ -127,34 +120,86 @@ class PurchaseDataPreprocessor:
             pd.DataFrame: Processed features ready for model prediction
         """
         logger.info("Transforming inference data...")
-        processed_df = df.copy()
         
         # Handle missing data consistently
         if self.handle_missing == 'drop':
-            initial_rows = len(processed_df)
-            processed_df = processed_df.dropna()
-            dropped_rows = initial_rows - len(processed_df)
+            initial_rows = len(df)
+            df = self._drop_incomplete_rows(df)
+            dropped_rows = initial_rows - len(df)
             
             if dropped_rows > 0:
                 logger.warning(f"Dropped {dropped_rows} inference rows with missing values")
         
-        # Use saved encoder
-        processed_df['category_encoded'] = self.le_category.transform(processed_df['category'])
-        processed_df['previously_purchased_encoded'] = processed_df['previously_purchased'].map({'yes': 1, 'no': 0})
+        # Use saved encoder; return only features (no target for inference)
+        return self._build_features(df, self._encode_categories(df['category']))
+    
+    def get_category_mapping(self):
+        """
+        Return the fitted category -> code mapping (same codes as le_category.transform).
         
-        # Apply consistent type conversions
-        if self.use_float_types:
-            processed_df['category_encoded'] = processed_df['category_encoded'].astype('float64')
-            processed_df['previously_purchased_encoded'] = processed_df['previously_purchased_encoded'].astype('float64')
-            processed_df['price'] = processed_df['price'].astype('float64')
-            processed_df['user_rating'] = processed_df['user_rating'].astype('float64')
+        The dict is built once per fitted encoder and reused by every transform call.
+        """
+        classes = self.le_category.classes_
+        if self._category_map is None or self._category_map[0] is not classes:
+            self._category_map = (classes, {c: i for i, c in enumerate(classes.tolist())})
+        return self._category_map[1]
+    
+    def _encode_categories(self, categories):
+        """Encode a category Series with the cached mapping instead of LabelEncoder.transform."""
+        codes = categories.map(self.get_category_mapping())
+        unseen = codes.isna()
+        if unseen.any():
+            raise ValueError(f"y contains previously unseen labels: {list(categories[unseen].unique())}")
+        return codes.astype('int64')
+    
+    @staticmethod
+    def _encode_purchased(values):
+        """
+        Encode previously_purchased as 1/0 with a vectorized compare.
         
-        # Return only features (no target for inference)
-        return processed_df[self.feature_columns]
+        Values other than 'yes'/'no' raise instead of being silently encoded;
+        missing values stay NaN, as with the mapping this replaces.
+        """
+        purchased = values.eq('yes')
+        missing = values.isna()
+        invalid = ~(purchased | values.eq('no') | missing)
+        if invalid.any():
+            raise ValueError(f"previously_purchased must be 'yes' or 'no', got: {list(values[invalid].unique())}")
+        encoded = purchased.astype(np.int8)
+        return encoded.where(~missing) if missing.any() else encoded
+    
+    @staticmethod
+    def _drop_incomplete_rows(df):
+        """Drop rows with missing values, returning df itself (no copy) when none are missing."""
+        complete = df.notna().all(axis=1)
+        return df if complete.all() else df[complete]
+    
+    def _build_features(self, df, category_encoded):
+        """
+        Assemble the feature frame directly from the raw columns.
+        
+        Only the feature columns are materialized; the input frame is never copied.
+        """
+        columns = {
+            'price': df['price'],
+            'user_rating': df['user_rating'],
+            'category_encoded': pd.Series(category_encoded, index=df.index),
+            # Convert previously_purchased to binary
+            'previously_purchased_encoded': self._encode_purchased(df['previously_purchased'])
+        }
+        
+        # Convert to appropriate types for MLFlow compatibility
+        if self.use_float_types:
+            columns = {name: column.astype('float64') for name, column in columns.items()}
+        elif len(self.le_category.classes_) <= np.iinfo(np.int8).max:
+            # Integer mode: the category codes fit in one byte like the binary flag
+            columns['category_encoded'] = columns['category_encoded'].astype(np.int8)
+
+        return pd.DataFrame({name: columns[name] for name in self.feature_columns}, index=df.index)
     
-    def _extract_features_target(self, df):
-        """Extract features and target from processed dataframe."""
-        X = df[self.feature_columns]
+    def _extract_features_target(self, df, category_encoded):
+        """Build features and extract target from the (missing-data-handled) raw dataframe."""
+        X = self._build_features(df, category_encoded)
         y = df[self.target_column] if self.target_column in df.columns else None
         
         logger.info(f"Extracted features shape: {X.shape}")
@@ -260,6 +305,14 @@ def save_processed_data(X_train, y_train, X_test, y_test, processed_dir='process
     train_processed.to_csv(train_path, index=False)
     test_processed.to_csv(test_path, index=False)
     
+    # Record the column types so CSV reloads match the frames (and Parquet copies) exactly
+    _write_dtypes_sidecar(train_processed, train_path)
+    _write_dtypes_sidecar(test_processed, test_path)
+    
+    # Columnar copies for faster reloads; the CSVs stay the canonical format
+    _write_parquet_copy(train_processed, train_path)
+    _write_parquet_copy(test_processed, test_path)
+    
     logger.info(f"Processed training data saved to {train_path}")
     logger.info(f"Processed test data saved to {test_path}")
     
@@ -280,16 +333,15 @@ def load_processed_data(processed_dir='processed_data'):
     test_path = os.path.join(processed_dir, 'test_processed.csv')
     
     if os.path.exists(train_path) and os.path.exists(test_path):
-        train_df = pd.read_csv(train_path)
-        test_df = pd.read_csv(test_path)
-        
         # Extract features and target
         feature_columns = ['price', 'user_rating', 'category_encoded', 'previously_purchased_encoded']
+        columns = feature_columns + ['label']
+        
+        train_df = _read_processed_file(train_path, columns)
+        test_df = _read_processed_file(test_path, columns)
         
-        X_train = train_df[feature_columns]
-        y_train = train_df['label']
-        X_test = test_df[feature_columns]
-        y_test = test_df['label']
+        X_train, y_train = _split_features_label(train_df, feature_columns)
+        X_test, y_test = _split_features_label(test_df, feature_columns)
         
         logger.info(f"Loaded processed training data: {X_train.shape}")
         logger.info(f"Loaded processed test data: {X_test.shape}")
@@ -297,4 +349,75 @@ def load_processed_data(processed_dir='processed_data'):
         return X_train, X_test, y_train, y_test
     
     logger.info("No processed data found")
-    return None
\ No newline at end of file
+    return None
+
+
+def _split_features_label(df, feature_columns):
+    """Split a processed frame positionally; the features lead the label in our own files."""
+    n_features = len(feature_columns)
+    if list(df.columns[:n_features]) == feature_columns:
+        # Positional slice: no per-label lookup or block gathering
+        X = df.iloc[:, :n_features]
+    else:
+        X = df.iloc[:, df.columns.get_indexer(feature_columns)]
+    return X, df.iloc[:, df.columns.get_loc('label')]
+
+
+def _parquet_path_for(csv_path):
+    """Return the Parquet copy path for a processed CSV file."""
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def _dtypes_path_for(csv_path):
+    """Return the column-types sidecar path for a processed CSV file."""
+    return os.path.splitext(csv_path)[0] + '.dtypes.json'
+
+
+def _write_dtypes_sidecar(df, csv_path):
+    """Write the frame's column dtypes next to a processed CSV file."""
+    with open(_dtypes_path_for(csv_path), 'w') as f:
+        json.dump({column: str(dtype) for column, dtype in df.dtypes.items()}, f)
+
+
+def _read_dtypes_sidecar(csv_path):
+    """Return the recorded column dtypes for a processed CSV, or None if missing or older than the CSV."""
+    dtypes_path = _dtypes_path_for(csv_path)
+    try:
+        if os.path.getmtime(dtypes_path) < os.path.getmtime(csv_path):
+            return None
+        with open(dtypes_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_parquet_copy(df, csv_path):
+    """Write a Parquet copy next to a processed CSV file (skipped without pyarrow)."""
+    parquet_path = _parquet_path_for(csv_path)
+    try:
+        df.to_parquet(parquet_path, engine='pyarrow', compression='snappy', index=False)
+    except ImportError:
+        logger.info("pyarrow not installed - skipping Parquet copy of processed data")
+        return None
+    
+    logger.info(f"Parquet copy saved to {parquet_path}")
+    return parquet_path
+
+
+def _read_processed_file(csv_path, columns):
+    """Read a processed dataset, preferring its Parquet copy when it is up to date."""
+    parquet_path = _parquet_path_for(csv_path)
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        try:
+            return pd.read_parquet(parquet_path, columns=columns, engine='pyarrow')
+        except ImportError:
+            pass
+    
+    # Types recorded at save time (int8 codes in integer mode), else the float-mode defaults
+    recorded = _read_dtypes_sidecar(csv_path) or {}
+    dtypes = {column: recorded.get(column, PROCESSED_DTYPES[column]) for column in columns}
+    try:
+        # Arrow's multithreaded CSV parser
+        return pd.read_csv(csv_path, usecols=columns, dtype=dtypes, engine='pyarrow')
+    except ImportError:
+        return pd.read_csv(csv_path, usecols=columns, dtype=dtypes)